@@ -0,0 +1,90 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+
+_cached_users = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def forget_user(user_id):
+    """Удаляет пользователя из кеша аутентификации процесса."""
+    with _cache_lock:
+        _cached_users.pop(user_id, None)
+
+
+def clear_users():
+    with _cache_lock:
+        _cached_users.clear()
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication, который не читает пользователя из базы на
+    каждый запрос.
+
+    Значения полей пользователя хранятся в памяти процесса
+    `API_USER_CACHE['TIMEOUT']` секунд, и каждый запрос получает
+    собственный экземпляр модели. Запись удаляется при сохранении
+    или удалении пользователя (см. api/signals.py). Изменения,
+    сделанные в других процессах, вступают в силу для чтения не позже
+    чем через TIMEOUT.
+
+    Изменяющие запросы всегда читают пользователя из базы: иначе
+    сохранение устаревшего экземпляра вернуло бы role и is_active,
+    изменённые другим процессом.
+    """
+
+    use_cache = True
+
+    def authenticate(self, request):
+        self.use_cache = request.method in SAFE_METHODS
+        return super().authenticate(request)
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+        row = self.get_cached_row(user_id) if self.use_cache else None
+        if row is None:
+            user = super().get_user(validated_token)
+            self.remember(user_id, user)
+            return user
+        user = self.user_model.from_db(None, *row)
+        if not user.is_active:
+            raise AuthenticationFailed(
+                _('User is inactive'), code='user_inactive'
+            )
+        return user
+
+    @staticmethod
+    def get_cached_row(user_id):
+        with _cache_lock:
+            cached = _cached_users.get(user_id)
+            if cached is None:
+                return None
+            expires, row = cached
+            if expires < time.monotonic():
+                del _cached_users[user_id]
+                return None
+            return row
+
+    def remember(self, user_id, user):
+        options = settings.API_USER_CACHE
+        field_names = [
+            field.attname for field in self.user_model._meta.concrete_fields
+        ]
+        row = (field_names, [getattr(user, name) for name in field_names])
+        with _cache_lock:
+            _cached_users[user_id] = (
+                time.monotonic() + options['TIMEOUT'], row
+            )
+            _cached_users.move_to_end(user_id)
+            if len(_cached_users) > options['MAX_SIZE']:
+                _cached_users.popitem(last=False)
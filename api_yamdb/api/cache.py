@@ -0,0 +1,167 @@
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+VERSION_KEY_TEMPLATE = 'api:version:{}'
+RESPONSE_KEY_TEMPLATE = 'api:response:{}'
+
+
+def get_cache():
+    return caches[settings.API_RESPONSE_CACHE['ALIAS']]
+
+
+def get_version_timeout():
+    options = settings.API_RESPONSE_CACHE
+    return options.get('VERSION_TIMEOUT', options['TIMEOUT'])
+
+
+def bump_version(label):
+    """
+    Меняет версию данных модели, делая устаревшими закешированные ответы.
+
+    Версия — метка времени, а не счётчик: если ключ версии вытеснен из
+    кеша, новая версия не совпадёт ни с одной из прежних. Версия
+    меняется после фиксации транзакции, чтобы чтение до фиксации не
+    сохранило старые данные под новой версией. Ключи версий живут
+    ограниченное время: если кеш не общий, другие процессы увидят
+    изменения не позже чем через VERSION_TIMEOUT.
+    """
+    transaction.on_commit(lambda: get_cache().set(
+        VERSION_KEY_TEMPLATE.format(label), time.time_ns(),
+        get_version_timeout()
+    ))
+
+
+def get_versions(labels):
+    cache = get_cache()
+    keys = [VERSION_KEY_TEMPLATE.format(label) for label in labels]
+    versions = cache.get_many(keys)
+    missing = {key: time.time_ns() for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, get_version_timeout())
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+def get_response_key(request, labels):
+    query = urlencode(sorted(request.query_params.lists()), doseq=True)
+    versions = '.'.join(str(version) for version in get_versions(labels))
+    url = f'{versions}:{request.get_host()}{request.path}?{query}'
+    return RESPONSE_KEY_TEMPLATE.format(
+        hashlib.md5(url.encode()).hexdigest()
+    )
+
+
+class ResponseCacheMixin:
+    """
+    Кеширует данные успешных ответов на GET-запросы списка.
+
+    Ключ строится из пути и отсортированных параметров запроса и
+    включает версии моделей из `cache_dependencies`; версии меняются
+    сигналами из `api.signals` при любой записи в эти модели.
+    """
+
+    cache_dependencies = ()
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        cache = get_cache()
+        key = get_response_key(request, self.cache_dependencies)
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(
+                key, response.data, settings.API_RESPONSE_CACHE['TIMEOUT']
+            )
+        return response
+
+
+class ConditionalGetMixin:
+    """
+    Обрабатывает If-None-Match и If-Modified-Since для list и retrieve.
+
+    Валидаторы строятся из версий моделей `cache_dependencies` и, если
+    задан `last_modified_field`, из количества строк, максимального id
+    и максимальной даты выборки — одним агрегирующим запросом, без
+    сериализации страницы. При совпадении возвращается 304.
+    """
+
+    cache_dependencies = ()
+    last_modified_field = None
+    conditional_headers = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method not in ('GET', 'HEAD') or (
+            self.action not in ('list', 'retrieve')
+        ):
+            return
+        etag, last_modified = self.get_validators(request)
+        not_modified = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if not_modified is not None:
+            # Подменяем обработчик так же, как это делает as_view().
+            setattr(
+                self, request.method.lower(),
+                lambda *args, **kwargs: not_modified
+            )
+        self.conditional_headers = {
+            'ETag': etag, 'Last-Modified': http_date(last_modified)
+        }
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(
+            request, response, *args, **kwargs
+        )
+        if self.conditional_headers and response.status_code in (
+            status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED
+        ):
+            for header, value in self.conditional_headers.items():
+                response[header] = value
+        return response
+
+    def get_validators(self, request):
+        versions = get_versions(self.cache_dependencies)
+        last_modified = max(versions, default=0) // 10 ** 9
+        state = None
+        if self.last_modified_field:
+            state = self.get_validator_queryset().aggregate(
+                count=Count('pk'), max_pk=Max('pk'),
+                last_modified=Max(self.last_modified_field)
+            )
+            if state['last_modified']:
+                last_modified = max(
+                    last_modified, int(state['last_modified'].timestamp())
+                )
+                state['last_modified'] = state['last_modified'].isoformat()
+        fingerprint = (
+            f'{request.get_full_path()}:{request.accepted_media_type}:'
+            f'{versions}:{state}'
+        )
+        return (
+            quote_etag(hashlib.md5(fingerprint.encode()).hexdigest()),
+            last_modified
+        )
+
+    def get_validator_queryset(self):
+        queryset = self.filter_queryset(self.get_queryset()).order_by()
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        if lookup_url_kwarg in self.kwargs:
+            queryset = queryset.filter(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            )
+        return queryset
@@ -1,6 +1,14 @@
+from django.db.models import Exists, OuterRef
 from django_filters import rest_framework as filters
 
-from reviews.models import Title
+from reviews.models import Category, Genre, Title
+
+GENRE_MODE_ANY = 'any'
+GENRE_MODE_ALL = 'all'
+
+
+class SlugInFilter(filters.BaseInFilter, filters.CharFilter):
+    """Список слагов через запятую: `?genre=drama,comedy`."""
 
 
 class TitleFilter(filters.FilterSet):
@@ -9,15 +17,50 @@ class TitleFilter(filters.FilterSet):
         field_name='name',
         lookup_expr='icontains'
     )
-    category = filters.CharFilter(
-        field_name='category__slug',
-        lookup_expr='icontains'
-    )
-    genre = filters.CharFilter(
-        field_name='genre__slug',
-        lookup_expr='icontains'
+    category = SlugInFilter(method='filter_category')
+    genre = SlugInFilter(method='filter_genre')
+    genre_mode = filters.ChoiceFilter(
+        choices=((GENRE_MODE_ANY, 'Любой из жанров'),
+                 (GENRE_MODE_ALL, 'Все жанры')),
+        method=lambda queryset, name, value: queryset
     )
+    search = filters.CharFilter(method='filter_search')
 
     class Meta:
         model = Title
-        fields = ('name', 'year', 'category', 'genre')
+        fields = ('name', 'year', 'category', 'genre', 'genre_mode', 'search')
+
+    def filter_category(self, queryset, name, value):
+        category_ids = list(
+            Category.objects.filter(slug__in=value).values_list(
+                'id', flat=True
+            )
+        )
+        return queryset.filter(category_id__in=category_ids)
+
+    def filter_genre(self, queryset, name, value):
+        """
+        Жанры заранее переводятся в id, а каждое условие проверяется
+        подзапросом EXISTS по таблице связи: фильтр использует индексы
+        и не размножает строки произведений.
+        """
+        genre_ids = list(
+            Genre.objects.filter(slug__in=value).values_list('id', flat=True)
+        )
+        title_genres = Title.genre.through.objects.filter(
+            title_id=OuterRef('pk')
+        )
+        if self.form.cleaned_data.get('genre_mode') != GENRE_MODE_ALL:
+            return queryset.filter(
+                Exists(title_genres.filter(genre_id__in=genre_ids))
+            )
+        if len(genre_ids) < len(set(value)):
+            return queryset.none()
+        for genre_id in genre_ids:
+            queryset = queryset.filter(
+                Exists(title_genres.filter(genre_id=genre_id))
+            )
+        return queryset
+
+    def filter_search(self, queryset, name, value):
+        return queryset.search(value)
@@ -0,0 +1,94 @@
+from timeit import repeat
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from api.serializers import TitleRowSerializer, TitleSerializerRead
+from reviews.models import Category, Genre, Title
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает скорость TitleSerializerRead и TitleRowSerializer '
+        'на сгенерированных данных. Данные удаляются после замера.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--titles', type=int, default=1000)
+        parser.add_argument('--page-size', type=int, default=100)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--number', type=int, default=10)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.generate(options['titles'])
+                self.run(options)
+                raise Rollback
+        except Rollback:
+            pass
+
+    def generate(self, count):
+        Category.objects.bulk_create(
+            Category(name=f'Категория {i}', slug=f'bench-category-{i}')
+            for i in range(10)
+        )
+        Genre.objects.bulk_create(
+            Genre(name=f'Жанр {i}', slug=f'bench-genre-{i}')
+            for i in range(20)
+        )
+        # SQLite не возвращает id из bulk_create, перечитываем объекты.
+        categories = list(
+            Category.objects.filter(slug__startswith='bench-category-')
+        )
+        genres = list(Genre.objects.filter(slug__startswith='bench-genre-'))
+        Title.objects.bulk_create(
+            Title(
+                name=f'Произведение {i}', year=1900 + i % 120,
+                description='Описание ' * 20,
+                category=categories[i % len(categories)],
+                rating_sum=i % 50, rating_count=i % 7
+            )
+            for i in range(count)
+        )
+        Title.genre.through.objects.bulk_create(
+            Title.genre.through(title_id=title_id, genre=genre)
+            for title_id in Title.objects.values_list('id', flat=True)
+            for genre in genres[title_id % 17:title_id % 17 + 3]
+        )
+
+    def run(self, options):
+        queryset = Title.objects.with_rating().order_by(
+            *Title._meta.ordering
+        )[:options['page_size']]
+        model_page = queryset.select_related(
+            'category'
+        ).prefetch_related('genre')
+        row_page = TitleRowSerializer.project(queryset)
+
+        def model_serializer():
+            return TitleSerializerRead(list(model_page.all()), many=True).data
+
+        def row_serializer():
+            return TitleRowSerializer(list(row_page.all()), many=True).data
+
+        assert model_serializer() == row_serializer()
+        results = {}
+        for name, func in (('TitleSerializerRead', model_serializer),
+                           ('TitleRowSerializer', row_serializer)):
+            best = min(repeat(
+                func, repeat=options['repeat'], number=options['number']
+            )) / options['number']
+            results[name] = best
+            self.stdout.write(
+                f'{name:<20} {best * 1000:8.2f} мс на страницу '
+                f'из {options["page_size"]} произведений'
+            )
+        speedup = results['TitleSerializerRead'] / results[
+            'TitleRowSerializer'
+        ]
+        self.stdout.write(self.style.SUCCESS(f'Ускорение: {speedup:.1f}x'))
@@ -0,0 +1,182 @@
+import json
+import math
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ParseError
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(PageNumberPagination):
+    """
+    Постраничная пагинация с опциональным keyset-режимом.
+
+    Если в запросе передан параметр `cursor` (в том числе пустой),
+    страница выбирается условием по значениям полей сортировки
+    последнего объекта предыдущей страницы, без COUNT и OFFSET.
+    Сортировка берётся из атрибута `cursor_ordering` вьюсета (или
+    пагинатора) и должна заканчиваться уникальным полем, например `id`.
+    С `keyset_only = True` keyset-режим включён всегда.
+
+    Курсор не совмещается с параметрами `ordering` и `search`: их
+    порядок заменила бы сортировка курсора, поэтому такой запрос
+    отклоняется с ответом 400.
+    """
+
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Неверный курсор.'
+    cursor_conflict_message = (
+        'Параметр cursor нельзя совмещать с параметрами {params}.'
+    )
+    cursor_ordering = None
+    keyset_only = False
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = (
+            self.keyset_only
+            or self.cursor_query_param in request.query_params
+        )
+        if not self.keyset:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.check_query_params(request)
+        self.request = request
+        self.ordering = self.get_ordering(queryset, view)
+        position, self.reverse = self.decode_cursor(request)
+        self.page_size = self.get_page_size(request)
+
+        ordering = self.ordering
+        if self.reverse:
+            ordering = tuple(self.invert(field) for field in ordering)
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            try:
+                queryset = queryset.filter(self.seek(ordering, position))
+            except (OverflowError, TypeError, ValueError, ValidationError):
+                raise NotFound(self.invalid_cursor_message)
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if self.reverse:
+            results.reverse()
+
+        self.next_position = self.previous_position = None
+        if results and (has_more or self.reverse):
+            self.next_position = self.get_position(results[-1])
+        if results and (has_more or not self.reverse) and position:
+            self.previous_position = self.get_position(results[0])
+        return results
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+        return Response(OrderedDict([
+            ('next', self.get_cursor_link(self.next_position, False)),
+            ('previous', self.get_cursor_link(self.previous_position, True)),
+            ('results', data),
+        ]))
+
+    def check_query_params(self, request):
+        conflicts = [
+            param for param in (
+                api_settings.ORDERING_PARAM, api_settings.SEARCH_PARAM
+            )
+            if param in request.query_params
+        ]
+        if conflicts:
+            raise ParseError(self.cursor_conflict_message.format(
+                params=', '.join(conflicts)
+            ))
+
+    def get_ordering(self, queryset, view):
+        ordering = getattr(view, 'cursor_ordering', self.cursor_ordering)
+        if ordering is None:
+            ordering = (*queryset.model._meta.ordering, 'id')
+        return tuple(ordering)
+
+    @staticmethod
+    def invert(field):
+        return field[1:] if field.startswith('-') else f'-{field}'
+
+    @staticmethod
+    def seek(ordering, position):
+        """
+        Условие «строго после позиции» для составной сортировки:
+        (f1 > v1) OR (f1 = v1 AND f2 > v2) OR ...
+        """
+        condition = Q()
+        equal = Q()
+        for field, value in zip(ordering, position):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition |= equal & Q(**{f'{name}__{lookup}': value})
+            equal &= Q(**{name: value})
+        return condition
+
+    def get_position(self, instance):
+        if isinstance(instance, dict):
+            return [instance[field.lstrip('-')] for field in self.ordering]
+        return [
+            getattr(instance, field.lstrip('-')) for field in self.ordering
+        ]
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            cursor = json.loads(urlsafe_b64decode(encoded.encode('ascii')))
+            position, reverse = cursor['p'], bool(cursor.get('r'))
+        except (BinasciiError, KeyError, TypeError, UnicodeError,
+                ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or (
+            len(position) != len(self.ordering)
+        ) or not all(map(self.is_valid_value, position)):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    @staticmethod
+    def is_valid_value(value):
+        """
+        Значение позиции должно быть скаляром, который база примет как
+        параметр запроса: конечным числом в пределах 64-битного целого.
+        """
+        if value is None or isinstance(value, (bool, str)):
+            return True
+        if isinstance(value, int):
+            return -2 ** 63 <= value < 2 ** 63
+        return isinstance(value, float) and math.isfinite(value)
+
+    def encode_cursor(self, position, reverse):
+        cursor = {'p': position}
+        if reverse:
+            cursor['r'] = 1
+        # str() сохраняет микросекунды дат, в отличие от DjangoJSONEncoder.
+        data = json.dumps(cursor, default=str)
+        return urlsafe_b64encode(data.encode()).decode('ascii')
+
+    def get_cursor_link(self, position, reverse):
+        if position is None:
+            return None
+        url = remove_query_param(
+            self.request.build_absolute_uri(), self.page_query_param
+        )
+        return replace_query_param(
+            url, self.cursor_query_param,
+            self.encode_cursor(position, reverse)
+        )
+
+
+class AuthorFeedPagination(KeysetPagination):
+    """Лента отзывов или комментариев автора, всегда в keyset-режиме."""
+
+    cursor_ordering = ('-pub_date', '-id')
+    keyset_only = True
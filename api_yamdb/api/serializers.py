@@ -1,11 +1,16 @@
 from django.contrib.auth import get_user_model
-from django.contrib.auth.tokens import default_token_generator
-from django.contrib.auth.validators import ASCIIUsernameValidator
-from django.core.mail import send_mail
+from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
+from rest_framework_simplejwt import settings as jwt_settings
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.tokens import RefreshToken
 
-from reviews.models import Category, Comment, Genre, Review, Title
-from users.models import User
+from reviews.models import (MAX_SCORE, MIN_SCORE, Category, Comment, Genre,
+                            Review, Title)
+from users.constants import MAX_EMAIL_LENGTH, MAX_NAME_LENGTH
+from users.models import RevokedToken
+from users.validators import username_is_not_me
 
 User = get_user_model()
 
@@ -58,6 +63,88 @@ class TitleSerializerRead(serializers.ModelSerializer):
         )
 
 
+class TitleRowListSerializer(serializers.ListSerializer):
+
+    def to_representation(self, data):
+        rows = list(data)
+        self.child.genres = self.child.load_genres(
+            [row['id'] for row in rows]
+        )
+        return [self.child.to_representation(row) for row in rows]
+
+
+class TitleRowSerializer(serializers.BaseSerializer):
+    """
+    Быстрый сериализатор произведений для чтения.
+
+    Работает со строками `values(*values_fields)` и отдаёт тот же JSON,
+    что и TitleSerializerRead, но без создания полей ModelSerializer
+    для каждого объекта. Жанры страницы загружаются одним запросом.
+    """
+
+    values_fields = (
+        'id', 'name', 'year', 'rating', 'description',
+        'category__name', 'category__slug'
+    )
+    genres = None
+
+    class Meta:
+        list_serializer_class = TitleRowListSerializer
+
+    @classmethod
+    def project(cls, queryset):
+        return queryset.values(*cls.values_fields)
+
+    @staticmethod
+    def load_genres(title_ids):
+        genres = {}
+        rows = Title.genre.through.objects.filter(
+            title_id__in=title_ids
+        ).order_by(*(
+            f'genre__{field}' for field in Genre._meta.ordering
+        )).values_list('title_id', 'genre__name', 'genre__slug')
+        for title_id, name, slug in rows:
+            genres.setdefault(title_id, []).append(
+                {'name': name, 'slug': slug}
+            )
+        return genres
+
+    def to_representation(self, row):
+        genres = self.genres
+        if genres is None:
+            genres = self.load_genres([row['id']])
+        rating = row['rating']
+        return {
+            'id': row['id'],
+            'name': row['name'],
+            'year': row['year'],
+            'rating': None if rating is None else int(rating),
+            'description': row['description'],
+            'genre': genres.get(row['id'], []),
+            'category': {
+                'name': row['category__name'],
+                'slug': row['category__slug'],
+            },
+        }
+
+
+class LeaderboardQuerySerializer(serializers.Serializer):
+
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=10)
+
+
+class TopTitlesQuerySerializer(LeaderboardQuerySerializer):
+
+    min_reviews = serializers.IntegerField(min_value=1, default=1)
+    category = serializers.SlugField(required=False)
+    genre = serializers.SlugField(required=False)
+
+
+class TrendingTitlesQuerySerializer(LeaderboardQuerySerializer):
+
+    days = serializers.IntegerField(min_value=1, max_value=365, default=7)
+
+
 class TitleSerializerWrite(serializers.ModelSerializer):
 
     genre = serializers.SlugRelatedField(
@@ -89,18 +176,46 @@ class ReviewCommentSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Review
-        fields = ('id', 'author', 'score', 'text', 'pub_date')
-
-    def validate(self, data):
-        if (
-            self.context['request'].method == 'POST'
-            and Review.objects.filter(
-                author=self.context['request'].user,
-                title=self.context['view'].kwargs.get('title_id')
-            ).exists()
-        ):
-            raise serializers.ValidationError('Отзыв уже присутствует')
-        return data
+        fields = (
+            'id', 'author', 'score', 'text', 'pub_date', 'comments_count'
+        )
+
+    def create(self, validated_data):
+        """Повторный отзыв отклоняет ограничение unique_title_author."""
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError:
+            raise serializers.ValidationError(
+                {'non_field_errors': ['Отзыв уже присутствует']}
+            )
+
+
+class AuthorReviewSerializer(ReviewCommentSerializer):
+    """Отзыв в ленте автора: дополнительно указывает произведение."""
+
+    title = serializers.PrimaryKeyRelatedField(read_only=True)
+
+    class Meta(ReviewCommentSerializer.Meta):
+        fields = (*ReviewCommentSerializer.Meta.fields, 'title')
+
+
+class ReviewImportSerializer(serializers.Serializer):
+    """Строка JSON Lines при массовой загрузке отзывов."""
+
+    title = serializers.IntegerField(min_value=1)
+    author = serializers.CharField(max_length=MAX_NAME_LENGTH)
+    text = serializers.CharField()
+    score = serializers.IntegerField(min_value=MIN_SCORE, max_value=MAX_SCORE)
+
+
+class ExportQuerySerializer(serializers.Serializer):
+    """Фильтры потоковой выгрузки отзывов и комментариев."""
+
+    title = serializers.IntegerField(min_value=1, required=False)
+    author = serializers.CharField(max_length=MAX_NAME_LENGTH, required=False)
+    since = serializers.DateTimeField(required=False)
+    until = serializers.DateTimeField(required=False)
 
 
 class CommentSerializer(serializers.ModelSerializer):
@@ -112,51 +227,88 @@ class CommentSerializer(serializers.ModelSerializer):
         fields = ('id', 'author', 'text', 'pub_date')
 
 
+class AuthorCommentSerializer(CommentSerializer):
+    """Комментарий в ленте автора: дополнительно указывает отзыв."""
+
+    review = serializers.PrimaryKeyRelatedField(read_only=True)
+
+    class Meta(CommentSerializer.Meta):
+        fields = (*CommentSerializer.Meta.fields, 'review')
+
+
+class ReviewWithCommentsSerializer(ReviewCommentSerializer):
+    """Отзыв вместе с последними комментариями (`?embed_comments=N`)."""
+
+    comments = CommentSerializer(
+        source='latest_comments', many=True, read_only=True
+    )
+
+    class Meta(ReviewCommentSerializer.Meta):
+        fields = (*ReviewCommentSerializer.Meta.fields, 'comments')
+
+
+class EmbedCommentsQuerySerializer(serializers.Serializer):
+
+    embed_comments = serializers.IntegerField(min_value=0, max_value=20)
+
+
 class UserSignupSerializer(serializers.Serializer):
+    """
+    Регистрация пользователя без предварительных запросов к базе.
+
+    Уникальность username и email проверяет база: при IntegrityError
+    существующий пользователь возвращается, если совпадают оба поля,
+    иначе возвращается ошибка валидации.
+    """
 
     username = serializers.CharField(
-        required=True,
-        validators=(ASCIIUsernameValidator(),)
-    )
-    email = serializers.EmailField(
-        required=True,
+        max_length=MAX_NAME_LENGTH,
+        validators=(username_is_not_me, UnicodeUsernameValidator())
     )
+    email = serializers.EmailField(max_length=MAX_EMAIL_LENGTH)
 
-    def validate(self, data):
-        username = data.get('username')
-        email = data.get('email')
-
-        if User.objects.filter(
-                email=email
-        ).exclude(username=username).exists():
+    def create(self, validated_data):
+        try:
+            with transaction.atomic():
+                return User.objects.create(**validated_data)
+        except IntegrityError:
+            pass
+        user = User.objects.filter(
+            username=validated_data['username']
+        ).first()
+        if user is None:
             raise serializers.ValidationError(
-                'email уже зарегистрирован'
+                {'email': ['email уже зарегистрирован']}
             )
-
-        if User.objects.filter(
-                username=username
-        ).exclude(email=email).exists():
+        if user.email != validated_data['email']:
             raise serializers.ValidationError(
-                'username уже зарегистрирован'
+                {'username': ['username уже зарегистрирован']}
             )
+        return user
 
-        if data.get('username') == 'me':
-            raise serializers.ValidationError(
-                'Недопустимое имя пользователя: me'
-            )
 
-        return data
+class RefreshTokenSerializer(serializers.Serializer):
+    """
+    Обновление access-токена по refresh-токену.
 
-    def create(self, validated_data):
-        user = User.objects.get_or_create(
-            username=validated_data['username'],
-            email=validated_data['email']
-        )
-        confirmation_code = default_token_generator.make_token(user)
-        send_mail(
-            subject='Код подтверждения',
-            message=f'Ваш код подтверждения: {confirmation_code}',
-            from_email=None,
-            recipient_list=[user.email],
-        )
-        return user
+    Без ротации (ROTATE_REFRESH_TOKENS) это только проверка подписи,
+    без обращения к базе. С ротацией выдаётся новый refresh-токен, а
+    при BLACKLIST_AFTER_ROTATION старый отзывается одной вставкой в
+    RevokedToken, которая отклоняет и повторное использование.
+    """
+
+    refresh = serializers.CharField()
+
+    def validate(self, attrs):
+        refresh = RefreshToken(attrs['refresh'])
+        data = {'token': str(refresh.access_token)}
+        options = jwt_settings.api_settings
+        if options.ROTATE_REFRESH_TOKENS:
+            if options.BLACKLIST_AFTER_ROTATION and (
+                not RevokedToken.objects.revoke(refresh)
+            ):
+                raise TokenError('Токен отозван.')
+            refresh.set_jti()
+            refresh.set_exp()
+            data['refresh'] = str(refresh)
+        return data
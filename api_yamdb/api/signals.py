@@ -0,0 +1,29 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from api.authentication import forget_user
+from api.cache import bump_version
+from reviews.models import Category, Comment, Genre, Review, Title
+
+User = get_user_model()
+
+
+def bump_model_version(sender, **kwargs):
+    bump_version(sender._meta.label_lower)
+
+
+def forget_cached_user(sender, instance, **kwargs):
+    forget_user(instance.pk)
+
+
+def bump_title_genre_version(sender, action, **kwargs):
+    if action.startswith('post_'):
+        bump_version(Title._meta.label_lower)
+
+
+for model in (Category, Comment, Genre, Review, Title, User):
+    post_save.connect(bump_model_version, sender=model)
+    post_delete.connect(bump_model_version, sender=model)
+post_save.connect(forget_cached_user, sender=User)
+post_delete.connect(forget_cached_user, sender=User)
+m2m_changed.connect(bump_title_genre_version, sender=Title.genre.through)
@@ -0,0 +1,117 @@
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.throttling import ScopedRateThrottle
+
+MAX_LOCAL_BUCKETS = 10000
+SHARED_LOCK_TIMEOUT = 1
+SHARED_LOCK_WAIT = 0.1
+
+_local_buckets = OrderedDict()
+_local_lock = threading.Lock()
+
+
+def clear_buckets():
+    """Сбрасывает корзины токенов текущего процесса."""
+    with _local_lock:
+        _local_buckets.clear()
+
+
+class ScopedTokenBucketThrottle(ScopedRateThrottle):
+    """
+    Ограничение записи по алгоритму token bucket.
+
+    Область задаётся атрибутом `throttle_scope` представления, а лимит
+    `N/период` — в DEFAULT_THROTTLE_RATES: корзина вмещает N токенов
+    и пополняется со скоростью N за период. Безопасные методы не
+    ограничиваются. Корзины хранятся в памяти процесса; если задан
+    `API_THROTTLE['CACHE_ALIAS']`, — в общем кеше, чтобы лимит
+    действовал для всех процессов. Чтение и запись общей корзины
+    выполняются под блокировкой на атомарном cache.add(); если её не
+    удалось получить за SHARED_LOCK_WAIT секунд, корзина обновляется
+    без блокировки, и лимит на это время становится приблизительным.
+    """
+
+    def allow_request(self, request, view):
+        if request.method in SAFE_METHODS:
+            return True
+        self.scope = getattr(view, self.scope_attr, None)
+        if not self.scope:
+            return True
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        self.key = self.get_cache_key(request, view)
+        self.wait_seconds = self.take_token(self.key)
+        return self.wait_seconds is None
+
+    def wait(self):
+        return self.wait_seconds
+
+    def take_token(self, key):
+        """Возвращает None, если токен взят, иначе время ожидания."""
+        refill_rate = self.num_requests / self.duration
+        with self.bucket_lock(key):
+            now = self.timer()
+            tokens, updated = self.load_bucket(key) or (
+                self.num_requests, now
+            )
+            tokens = min(
+                self.num_requests, tokens + (now - updated) * refill_rate
+            )
+            wait = None
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / refill_rate
+            self.save_bucket(key, (tokens, now))
+        return wait
+
+    @staticmethod
+    def get_shared_cache():
+        alias = settings.API_THROTTLE.get('CACHE_ALIAS')
+        return caches[alias] if alias else None
+
+    @contextmanager
+    def bucket_lock(self, key):
+        """
+        Блокировка корзины: общая на cache.add() для общего кеша,
+        иначе блокировка процесса. Ожидание общей блокировки не
+        задерживает запросы с другими ключами.
+        """
+        shared_cache = self.get_shared_cache()
+        if shared_cache is None:
+            with _local_lock:
+                yield
+            return
+        lock_key = f'{key}:lock'
+        deadline = time.monotonic() + SHARED_LOCK_WAIT
+        locked = shared_cache.add(lock_key, True, SHARED_LOCK_TIMEOUT)
+        while not locked and time.monotonic() < deadline:
+            time.sleep(0.001)
+            locked = shared_cache.add(lock_key, True, SHARED_LOCK_TIMEOUT)
+        try:
+            yield
+        finally:
+            if locked:
+                shared_cache.delete(lock_key)
+
+    def load_bucket(self, key):
+        shared_cache = self.get_shared_cache()
+        if shared_cache is not None:
+            return shared_cache.get(key)
+        return _local_buckets.get(key)
+
+    def save_bucket(self, key, bucket):
+        shared_cache = self.get_shared_cache()
+        if shared_cache is not None:
+            shared_cache.set(key, bucket, self.duration)
+            return
+        _local_buckets[key] = bucket
+        _local_buckets.move_to_end(key)
+        if len(_local_buckets) > MAX_LOCAL_BUCKETS:
+            _local_buckets.popitem(last=False)
@@ -1,9 +1,10 @@
 from django.urls import include, path
 from rest_framework import routers
 
-from .views import (CategoryViewSet, CommentViewSet, GenreViewSet,
-                    JWTTokenView, ReviewViewSet, SignUpUserView, TitleViewSet,
-                    UserViewSet)
+from .views import (CategoryViewSet, CommentExportView, CommentViewSet,
+                    GenreViewSet, JWTRefreshView, JWTTokenView,
+                    ReviewExportView, ReviewImportView, ReviewViewSet,
+                    SignUpUserView, TitleViewSet, UserViewSet)
 
 app_name = 'api'
 
@@ -21,6 +22,14 @@ v1_router.register(r'users', UserViewSet, basename='user')
 
 urlpatterns = [
     path('v1/', include(v1_router.urls)),
+    path('v1/reviews/import/', ReviewImportView.as_view(),
+         name='reviews_import'),
+    path('v1/reviews/export/', ReviewExportView.as_view(),
+         name='reviews_export'),
+    path('v1/comments/export/', CommentExportView.as_view(),
+         name='comments_export'),
     path('v1/auth/token/', JWTTokenView.as_view(), name='token'),
+    path('v1/auth/token/refresh/', JWTRefreshView.as_view(),
+         name='token_refresh'),
     path('v1/auth/signup/', SignUpUserView.as_view(), name='signup')
 ]
@@ -1,79 +1,202 @@
-from smtplib import SMTPDataError
+import hashlib
+import json
+from collections import defaultdict
+from datetime import timedelta
+from functools import cached_property
+from operator import itemgetter
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
-from django.db.models import Avg
+from django.core.cache import caches
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, OuterRef, Sum
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
-from rest_framework_simplejwt.views import TokenObtainPairView
+from rest_framework_simplejwt.views import (TokenObtainPairView,
+                                            TokenRefreshView)
 
 from api.base import BaseViewSet
+from api.cache import (ConditionalGetMixin, ResponseCacheMixin,
+                       bump_version)
 from api.filters import TitleFilter
-from api.serializers import (CategorySerializer, CommentSerializer,
-                             GenreSerializer, ReviewCommentSerializer,
-                             TitleSerializerRead, TitleSerializerWrite,
-                             UserSerializer)
-from reviews.models import Category, Genre, Review, Title
+from api.pagination import AuthorFeedPagination, KeysetPagination
+from api.serializers import (AuthorCommentSerializer, AuthorReviewSerializer,
+                             CategorySerializer, CommentSerializer,
+                             EmbedCommentsQuerySerializer,
+                             ExportQuerySerializer, GenreSerializer,
+                             RefreshTokenSerializer, ReviewCommentSerializer,
+                             ReviewImportSerializer,
+                             ReviewWithCommentsSerializer, TitleRowSerializer,
+                             TitleSerializerWrite, TopTitlesQuerySerializer,
+                             TrendingTitlesQuerySerializer, UserSerializer,
+                             UserSignupSerializer)
+from api.throttling import ScopedTokenBucketThrottle
+from reviews.aggregates import add_reviews
+from reviews.models import (MAX_SCORE, MIN_SCORE, Category, Comment,
+                            DailyReviewCount, Genre, Review, Title,
+                            TitleRanking, TitleScore)
+from users.models import ConfirmationCode, OutgoingEmail
 from users.permissions import (IsAdminRolePermission, IsAuthorOrModerator,
                                IsReadOnlyOrAdmin)
 
 User = get_user_model()
 
+SIGNUP_COOLDOWN_KEY_TEMPLATE = 'api:signup:{}'
 
-class CategoryViewSet(BaseViewSet):
+
+class CategoryViewSet(ConditionalGetMixin, ResponseCacheMixin, BaseViewSet):
     permission_classes = (IsReadOnlyOrAdmin,)
+    cache_dependencies = ('reviews.category',)
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
 
 
-class GenreViewSet(BaseViewSet):
+class GenreViewSet(ConditionalGetMixin, ResponseCacheMixin, BaseViewSet):
     permission_classes = (IsReadOnlyOrAdmin,)
+    cache_dependencies = ('reviews.genre',)
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
 
 
-class TitleViewSet(viewsets.ModelViewSet):
-    queryset = Title.objects.annotate(
-        rating=Avg('reviews__score')).order_by(*Title._meta.ordering)
+class TitleViewSet(
+    ConditionalGetMixin, ResponseCacheMixin, viewsets.ModelViewSet
+):
+    queryset = Title.objects.with_rating().order_by(*Title._meta.ordering)
     permission_classes = (IsReadOnlyOrAdmin,)
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_class = TitleFilter
+    # TitleRowSerializer не объявляет fields, из которых OrderingFilter
+    # по умолчанию выводит допустимые поля.
+    ordering_fields = ('name', 'year', 'rating', 'id')
+    pagination_class = KeysetPagination
+    cursor_ordering = ('-year', 'name', 'id')
+    cache_dependencies = (
+        'reviews.title', 'reviews.genre', 'reviews.category', 'reviews.review'
+    )
     http_method_names = (
         'get', 'post', 'patch', 'delete', 'head', 'options', 'trace'
     )
 
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+    @action(detail=True, url_path='scores', url_name='scores')
+    def scores(self, request, pk=None):
+        """Распределение оценок произведения из хранимой гистограммы."""
+        get_object_or_404(Title.objects.only('id'), pk=pk)
+        counts = dict(
+            TitleScore.objects.filter(title_id=pk).values_list(
+                'score', 'count'
+            )
+        )
+        return Response(
+            [
+                {'score': score, 'count': counts.get(score, 0)}
+                for score in range(MIN_SCORE, MAX_SCORE + 1)
+            ],
+            status=status.HTTP_200_OK
+        )
+
+    @action(detail=False, url_path='top', url_name='top')
+    def top(self, request):
+        """Произведения с лучшей средней оценкой из TitleRanking."""
+        query = TopTitlesQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+        rankings = TitleRanking.objects.filter(
+            review_count__gte=params['min_reviews']
+        )
+        if 'category' in params:
+            rankings = rankings.filter(category_id__in=Category.objects.filter(
+                slug=params['category']
+            ).values('id'))
+        if 'genre' in params:
+            rankings = rankings.filter(Exists(
+                Title.genre.through.objects.filter(
+                    title_id=OuterRef('title_id'),
+                    genre__slug=params['genre']
+                )
+            ))
+        return self.leaderboard_response(
+            rankings.values_list('title_id', flat=True)[:params['limit']]
+        )
+
+    @action(detail=False, url_path='trending', url_name='trending')
+    def trending(self, request):
+        """Произведения с наибольшим числом отзывов за последние дни."""
+        query = TrendingTitlesQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+        since = timezone.localdate() - timedelta(days=params['days'] - 1)
+        return self.leaderboard_response(
+            DailyReviewCount.objects.filter(day__gte=since).values(
+                'title'
+            ).annotate(total=Sum('count')).filter(total__gt=0).order_by(
+                '-total', 'title_id'
+            ).values_list('title', flat=True)[:params['limit']]
+        )
+
+    def leaderboard_response(self, title_ids):
+        title_ids = list(title_ids)
+        rows = {
+            row['id']: row for row in TitleRowSerializer.project(
+                Title.objects.with_rating().filter(pk__in=title_ids)
+            )
+        }
+        serializer = TitleRowSerializer(
+            [rows[title_id] for title_id in title_ids if title_id in rows],
+            many=True
+        )
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    def get_queryset(self):
+        if self.action in ['list', 'retrieve']:
+            return TitleRowSerializer.project(super().get_queryset())
+        return super().get_queryset()
+
     def get_serializer_class(self):
         if self.action in ['list', 'retrieve']:
-            return TitleSerializerRead
+            return TitleRowSerializer
         return TitleSerializerWrite
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
 
     serializer_class = CommentSerializer
     permission_classes = (IsAuthorOrModerator,)
+    pagination_class = KeysetPagination
+    cursor_ordering = ('-pub_date', '-id')
+    cache_dependencies = ('reviews.comment', 'users.user')
+    throttle_classes = (ScopedTokenBucketThrottle,)
+    throttle_scope = 'comments'
+    last_modified_field = 'pub_date'
     http_method_names = (
         'get', 'post', 'patch', 'delete',
         'head', 'options', 'trace'
     )
 
-    @property
+    @cached_property
     def review(self):
+        """Отзыв вместе с произведением, один запрос на весь запрос API."""
         return get_object_or_404(
-            Review, pk=self.kwargs.get('review_id'),
+            Review.objects.select_related('title'),
+            pk=self.kwargs.get('review_id'),
             title=self.kwargs.get('title_id'))
 
     def get_queryset(self):
-        return self.review.comments.all()
+        return self.review.comments.with_author()
 
     def perform_create(self, serializer):
         serializer.save(
@@ -82,19 +205,57 @@ class CommentViewSet(viewsets.ModelViewSet):
         )
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     serializer_class = ReviewCommentSerializer
     permission_classes = (IsAuthorOrModerator,)
+    pagination_class = KeysetPagination
+    cursor_ordering = ('-pub_date', '-id')
+    cache_dependencies = ('reviews.review', 'reviews.comment', 'users.user')
+    throttle_classes = (ScopedTokenBucketThrottle,)
+    throttle_scope = 'reviews'
+    last_modified_field = 'pub_date'
     http_method_names = (
         'get', 'post', 'patch', 'delete', 'head', 'options', 'trace'
     )
 
-    @property
+    @cached_property
     def title(self):
         return get_object_or_404(Title, pk=self.kwargs.get('title_id'))
 
+    @cached_property
+    def embed_comments(self):
+        """Сколько последних комментариев вложить в каждый отзыв списка."""
+        if self.action != 'list' or (
+            'embed_comments' not in self.request.query_params
+        ):
+            return 0
+        query = EmbedCommentsQuerySerializer(data=self.request.query_params)
+        query.is_valid(raise_exception=True)
+        return query.validated_data['embed_comments']
+
     def get_queryset(self):
-        return self.title.reviews.all()
+        return self.title.reviews.with_author()
+
+    def get_serializer_class(self):
+        if self.embed_comments:
+            return ReviewWithCommentsSerializer
+        return super().get_serializer_class()
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if page is not None and self.embed_comments:
+            self.attach_latest_comments(page)
+        return page
+
+    def attach_latest_comments(self, reviews):
+        """Комментарии всей страницы загружаются одним запросом."""
+        comments = defaultdict(list)
+        for comment in Comment.objects.latest_for_reviews(
+            [review.pk for review in reviews], self.embed_comments
+        ).with_author():
+            comments[comment.review_id].append(comment)
+        for review in reviews:
+            review.latest_comments = comments[review.pk]
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user, title=self.title)
@@ -129,42 +290,283 @@ class UserViewSet(viewsets.ModelViewSet):
             return Response(status=status.HTTP_405_METHOD_NOT_ALLOWED)
         return super().update(request, *args, **kwargs)
 
+    @action(detail=False, url_path='me/reviews', url_name='my_reviews',
+            permission_classes=(IsAuthenticated,))
+    def my_reviews(self, request):
+        return self.author_feed(
+            Review, AuthorReviewSerializer, request.user.pk
+        )
+
+    @action(detail=False, url_path='me/comments', url_name='my_comments',
+            permission_classes=(IsAuthenticated,))
+    def my_comments(self, request):
+        return self.author_feed(
+            Comment, AuthorCommentSerializer, request.user.pk
+        )
+
+    @action(detail=True, permission_classes=(AllowAny,))
+    def reviews(self, request, username=None):
+        return self.author_feed(
+            Review, AuthorReviewSerializer, self.get_author_id(username)
+        )
+
+    @action(detail=True, permission_classes=(AllowAny,))
+    def comments(self, request, username=None):
+        return self.author_feed(
+            Comment, AuthorCommentSerializer, self.get_author_id(username)
+        )
+
+    @staticmethod
+    def get_author_id(username):
+        return get_object_or_404(
+            User.objects.only('id'), username=username
+        ).pk
+
+    def author_feed(self, model, serializer_class, author_id):
+        """
+        Отзывы или комментарии автора в keyset-пагинации по индексу
+        (author, -pub_date).
+        """
+        paginator = AuthorFeedPagination()
+        page = paginator.paginate_queryset(
+            model.objects.filter(author_id=author_id).with_author(),
+            self.request, view=self
+        )
+        serializer = serializer_class(
+            page, many=True, context=self.get_serializer_context()
+        )
+        return paginator.get_paginated_response(serializer.data)
+
+
+class ReviewImportView(APIView):
+    """
+    Массовая загрузка отзывов партнёров в формате JSON Lines.
+
+    Тело читается потоком и обрабатывается пачками по `batch_size`
+    строк: произведения, авторы и уже существующие отзывы пачки
+    загружаются тремя запросами, корректные строки сохраняются через
+    bulk_create в отдельной транзакции, а агрегаты произведений
+    обновляются один раз на произведение.
+
+    Если пачку не удалось сохранить из-за нарушения ограничений базы
+    (отзыв добавлен параллельным запросом или произведение удалено),
+    её строки сохраняются по одной, а ошибка относится к своей строке.
+    """
+
+    permission_classes = (IsAdminRolePermission,)
+    batch_size = 500
+
+    def post(self, request):
+        created = 0
+        errors = []
+        batch = []
+        stream = request.stream or ()
+        for number, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            batch.append((number, line))
+            if len(batch) == self.batch_size:
+                created += self.import_batch(batch, errors)
+                batch = []
+        if batch:
+            created += self.import_batch(batch, errors)
+        errors.sort(key=itemgetter('line'))
+        return Response(
+            {'created': created, 'errors': errors},
+            status=status.HTTP_200_OK
+        )
+
+    @staticmethod
+    def parse_batch(batch, errors):
+        rows = []
+        for number, line in batch:
+            try:
+                data = json.loads(line)
+            except ValueError:
+                errors.append({'line': number, 'errors': {
+                    'non_field_errors': ['Некорректный JSON.']
+                }})
+                continue
+            serializer = ReviewImportSerializer(data=data)
+            if serializer.is_valid():
+                rows.append((number, serializer.validated_data))
+            else:
+                errors.append({'line': number, 'errors': serializer.errors})
+        return rows
+
+    def import_batch(self, batch, errors):
+        rows = self.parse_batch(batch, errors)
+        title_ids = set(Title.objects.filter(
+            pk__in={row['title'] for _, row in rows}
+        ).values_list('id', flat=True))
+        author_ids = dict(User.objects.filter(
+            username__in={row['author'] for _, row in rows}
+        ).values_list('username', 'id'))
+        existing = self.get_existing(title_ids, author_ids.values())
+
+        reviews = []
+        for number, row in rows:
+            row_errors = {}
+            if row['title'] not in title_ids:
+                row_errors['title'] = ['Произведение не найдено.']
+            if row['author'] not in author_ids:
+                row_errors['author'] = ['Пользователь не найден.']
+            key = (row['title'], author_ids.get(row['author']))
+            if not row_errors and key in existing:
+                row_errors['non_field_errors'] = ['Отзыв уже присутствует']
+            if row_errors:
+                errors.append({'line': number, 'errors': row_errors})
+                continue
+            existing.add(key)
+            reviews.append((number, Review(
+                title_id=row['title'], author_id=key[1],
+                text=row['text'], score=row['score']
+            )))
+        if not reviews:
+            return 0
+        try:
+            with transaction.atomic():
+                Review.objects.bulk_create(
+                    review for _, review in reviews
+                )
+                add_reviews([review for _, review in reviews])
+            created = len(reviews)
+        except IntegrityError:
+            created = self.import_rows(reviews, errors)
+        if created:
+            bump_version(Review._meta.label_lower)
+        return created
+
+    @staticmethod
+    def get_existing(title_ids, author_ids):
+        return set(Review.objects.filter(
+            title_id__in=title_ids, author_id__in=author_ids
+        ).values_list('title_id', 'author_id'))
+
+    @staticmethod
+    def import_rows(reviews, errors):
+        created = 0
+        for number, review in reviews:
+            review.pk = None
+            try:
+                # Агрегаты обновляет обработчик post_save.
+                with transaction.atomic():
+                    review.save()
+            except IntegrityError:
+                errors.append({'line': number, 'errors': {
+                    'non_field_errors': [
+                        'Отзыв уже присутствует или произведение удалено.'
+                    ]
+                }})
+            else:
+                created += 1
+        return created
+
+
+class ExportView(APIView):
+    """
+    Потоковая выгрузка в формате NDJSON для аналитики.
+
+    Строки читаются курсором базы пачками по `chunk_size` через
+    values_list().iterator() и сразу отдаются клиенту, поэтому
+    расход памяти не зависит от объёма выгрузки. `fields` задаёт
+    ключи строки и соответствующие им поля выборки.
+    """
+
+    permission_classes = (IsAdminRolePermission,)
+    chunk_size = 2000
+    model = None
+    fields = {}
+    title_lookup = 'title_id'
+
+    def get(self, request):
+        query = ExportQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        rows = self.filter_queryset(
+            self.model.objects.all(), query.validated_data
+        ).order_by('pk').values_list(*self.fields.values())
+        return StreamingHttpResponse(
+            self.render_rows(rows.iterator(chunk_size=self.chunk_size)),
+            content_type='application/x-ndjson'
+        )
+
+    def filter_queryset(self, queryset, params):
+        lookups = {
+            'title': self.title_lookup,
+            'author': 'author__username',
+            'since': 'pub_date__gte',
+            'until': 'pub_date__lt',
+        }
+        return queryset.filter(**{
+            lookups[name]: value for name, value in params.items()
+        })
+
+    def render_rows(self, rows):
+        encoder = JSONEncoder(ensure_ascii=False)
+        for row in rows:
+            yield encoder.encode(dict(zip(self.fields, row))) + '\n'
+
+
+class ReviewExportView(ExportView):
+    model = Review
+    fields = {
+        'id': 'id',
+        'title': 'title_id',
+        'author': 'author__username',
+        'score': 'score',
+        'text': 'text',
+        'pub_date': 'pub_date',
+    }
+
+
+class CommentExportView(ExportView):
+    model = Comment
+    fields = {
+        'id': 'id',
+        'title': 'review__title_id',
+        'review': 'review_id',
+        'author': 'author__username',
+        'text': 'text',
+        'pub_date': 'pub_date',
+    }
+    title_lookup = 'review__title_id'
+
 
 class SignUpUserView(APIView):
     permission_classes = (AllowAny,)
+    throttle_classes = (ScopedTokenBucketThrottle,)
+    throttle_scope = 'signup'
 
     def post(self, request):
-        serializer = UserSerializer(data=request.data)
-
-        if serializer.is_valid():
-            user = serializer.save()
-            return self.send_confirmation_code(user)
-
-        if User.objects.filter(
-            username=request.data.get('username'),
-            email=request.data.get('email')
-        ).exists():
-            user = User.objects.get(
-                email=request.data.get('email')
-            )
-            return self.send_confirmation_code(user)
-
-        return Response(
-            serializer.errors,
-            status=status.HTTP_400_BAD_REQUEST
+        serializer = UserSignupSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        cache = caches[settings.API_SIGNUP_COOLDOWN['ALIAS']]
+        cooldown_key = self.get_cooldown_key(serializer.validated_data)
+        if cache.get(cooldown_key):
+            return Response(serializer.data, status=status.HTTP_200_OK)
+        user = serializer.save()
+        response = self.send_confirmation_code(user)
+        cache.set(
+            cooldown_key, True, settings.API_SIGNUP_COOLDOWN['TIMEOUT']
         )
+        return response
+
+    @staticmethod
+    def get_cooldown_key(data):
+        digest = hashlib.md5(
+            f'{data["username"]}\n{data["email"]}'.encode()
+        ).hexdigest()
+        return SIGNUP_COOLDOWN_KEY_TEMPLATE.format(digest)
 
     def send_confirmation_code(self, user):
-        confirmation_code = default_token_generator.make_token(user)
-        try:
-            self.send_confirmation_email(user, confirmation_code)
-        except SMTPDataError as e:
-            print(f'Ошибка отправки email: {e}')
-            return Response(
-                {'error': 'Ошибка при отправке письма с кодом подтверждения.'},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        """Письмо с кодом ставится в очередь, его отправит send_outbox."""
+        with transaction.atomic():
+            confirmation_code = ConfirmationCode.objects.issue(user)
+            OutgoingEmail.objects.create(
+                recipient=user.email,
+                subject='Код подтверждения:',
+                body=f'{confirmation_code}',
             )
-
         return Response(
             {
                 'username': user.username,
@@ -173,15 +575,6 @@ class SignUpUserView(APIView):
             status=status.HTTP_200_OK
         )
 
-    def send_confirmation_email(self, user, confirmation_code):
-        send_mail(
-            subject='Код подтверждения:',
-            message=f'{confirmation_code}',
-            from_email=settings.EMAIL_HOST_USER,
-            recipient_list=[user.email],
-            fail_silently=False,
-        )
-
 
 class JWTTokenView(TokenObtainPairView):
 
@@ -198,9 +591,15 @@ class JWTTokenView(TokenObtainPairView):
         if errors:
             return Response(errors, status=status.HTTP_400_BAD_REQUEST)
 
-        user = get_object_or_404(User, username=username)
-
-        if not default_token_generator.check_token(user, confirmation_code):
+        user = get_object_or_404(
+            User.objects.select_related('otp').only(
+                'id', 'otp__code_hash', 'otp__expires', 'otp__attempts'
+            ),
+            username=username
+        )
+        # Без кода обратный OneToOne бросает AttributeError-наследника.
+        otp = getattr(user, 'otp', None)
+        if otp is None or not otp.verify(confirmation_code):
             return Response(
                 {'error': 'Неверный код подтверждения!'},
                 status=status.HTTP_400_BAD_REQUEST
@@ -208,6 +607,10 @@ class JWTTokenView(TokenObtainPairView):
 
         refresh = RefreshToken.for_user(user)
         return Response(
-            {'token': str(refresh.access_token)},
+            {'token': str(refresh.access_token), 'refresh': str(refresh)},
             status=status.HTTP_200_OK
         )
+
+
+class JWTRefreshView(TokenRefreshView):
+    serializer_class = RefreshTokenSerializer
@@ -75,9 +75,54 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Файловая тестовая база: в in-memory базе с общим кешем
+        # параллельные запросы падают с "database table is locked".
+        'TEST': {
+            'NAME': BASE_DIR / 'test_db.sqlite3',
+        },
+    }
+}
+
+
+# Cache
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
     }
 }
 
+# Версии моделей для кеша ответов и ETag живут VERSION_TIMEOUT секунд.
+# С кешем в памяти процесса (locmem) другие процессы видят изменения не
+# позже чем через это время; для мгновенной инвалидации нужен общий
+# кеш (Redis, Memcached).
+API_RESPONSE_CACHE = {
+    'ALIAS': 'default',
+    'TIMEOUT': 60 * 5,
+    'VERSION_TIMEOUT': 60 * 5,
+}
+
+# None — корзины токенов в памяти процесса; псевдоним кеша из CACHES —
+# общий лимит для всех процессов. Общая корзина обновляется под
+# блокировкой на cache.add(), поэтому нужен кеш с атомарным add()
+# (Memcached, Redis, база данных); locmem процессы не разделяют.
+API_THROTTLE = {
+    'CACHE_ALIAS': None,
+}
+
+# Повторная регистрация с теми же username и email в течение TIMEOUT
+# секунд отвечает 200 без обращения к базе и новой отправки кода.
+API_SIGNUP_COOLDOWN = {
+    'ALIAS': 'default',
+    'TIMEOUT': 60,
+}
+
+# Кеш пользователей JWT-аутентификации в памяти процесса.
+API_USER_CACHE = {
+    'TIMEOUT': 60,
+    'MAX_SIZE': 10000,
+}
+
 
 # Password validation
 
@@ -130,18 +175,25 @@ else:
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 5,
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend'
     ],
+    'DEFAULT_THROTTLE_RATES': {
+        'reviews': '30/min',
+        'comments': '60/min',
+        'signup': '10/min',
+    },
 }
 
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=360),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
+    # С ротацией /auth/token/refresh/ выдаёт новый refresh-токен, а с
+    # BLACKLIST_AFTER_ROTATION старый отзывается (users.RevokedToken).
     'ROTATE_REFRESH_TOKENS': False,
     'BLACKLIST_AFTER_ROTATION': False,
     'UPDATE_LAST_LOGIN': False,
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Category, Comment, Genre, Review, Title
+from .models import Category, Comment, Genre, Review, Title, TitleScore
 
 
 @admin.register(Category)
@@ -17,11 +17,22 @@ class GenreAdmin(admin.ModelAdmin):
     )
 
 
+class TitleScoreInline(admin.TabularInline):
+    model = TitleScore
+    extra = 0
+    readonly_fields = ('score', 'count')
+    can_delete = False
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
 @admin.register(Title)
 class TitleAdmin(admin.ModelAdmin):
     list_display = (
         'name', 'display_genre', 'description', 'category', 'year'
     )
+    inlines = (TitleScoreInline,)
 
     @admin.display(description='Genres')
     def display_genre(self, obj):
@@ -0,0 +1,31 @@
+from collections import Counter
+
+from django.db.models import F
+from django.utils import timezone
+
+from .models import DailyReviewCount, Title, TitleRanking, TitleScore
+
+
+def add_reviews(reviews):
+    """
+    Учитывает новые отзывы в хранимых агрегатах произведений.
+
+    Изменения группируются, поэтому на каждое произведение, оценку и
+    день приходится по одному UPDATE независимо от числа отзывов.
+    """
+    sums, counts, scores, days = Counter(), Counter(), Counter(), Counter()
+    for review in reviews:
+        sums[review.title_id] += review.score
+        counts[review.title_id] += 1
+        scores[review.title_id, review.score] += 1
+        days[review.title_id, timezone.localdate(review.pub_date)] += 1
+    for title_id, count in counts.items():
+        Title.objects.filter(pk=title_id).update(
+            rating_sum=F('rating_sum') + sums[title_id],
+            rating_count=F('rating_count') + count
+        )
+    for (title_id, score), count in scores.items():
+        TitleScore.objects.change(count, title_id=title_id, score=score)
+    for (title_id, day), count in days.items():
+        DailyReviewCount.objects.change(count, title_id=title_id, day=day)
+    TitleRanking.objects.refresh(counts)
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.models import DailyReviewCount, TitleRanking
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересобирает таблицы рейтинга и отзывов по дням для '
+        '/titles/top/ и /titles/trending/.'
+    )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            rankings = TitleRanking.objects.rebuild()
+            days = DailyReviewCount.objects.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f'Произведений в рейтинге: {len(rankings)}, '
+            f'строк отзывов по дням: {len(days)}'
+        ))
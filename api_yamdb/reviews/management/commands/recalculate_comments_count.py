@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from reviews.models import Review
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает хранимое количество комментариев к отзывам.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'review_ids', nargs='*', type=int,
+            help='id отзывов; по умолчанию пересчитываются все.'
+        )
+
+    def handle(self, *args, **options):
+        reviews = Review.objects.all()
+        if options['review_ids']:
+            reviews = reviews.filter(pk__in=options['review_ids'])
+        updated = reviews.recalculate_comments_count()
+        self.stdout.write(
+            self.style.SUCCESS(f'Пересчитано отзывов: {updated}')
+        )
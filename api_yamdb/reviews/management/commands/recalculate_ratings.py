@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.models import Title, TitleScore
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает хранимый рейтинг и распределение оценок '
+        'произведений по отзывам.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'title_ids', nargs='*', type=int,
+            help='id произведений; по умолчанию пересчитываются все.'
+        )
+
+    def handle(self, *args, **options):
+        titles = Title.objects.all()
+        if options['title_ids']:
+            titles = titles.filter(pk__in=options['title_ids'])
+        with transaction.atomic():
+            updated = titles.recalculate_rating()
+            TitleScore.objects.rebuild(titles)
+        self.stdout.write(
+            self.style.SUCCESS(f'Пересчитан рейтинг произведений: {updated}')
+        )
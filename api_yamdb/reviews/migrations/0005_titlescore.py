@@ -0,0 +1,47 @@
+# Generated by Django 3.2 on 2026-10-18 16:59
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_scores(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    TitleScore = apps.get_model('reviews', 'TitleScore')
+    TitleScore.objects.bulk_create(
+        TitleScore(title_id=row['title'], score=row['score'],
+                   count=row['count'])
+        for row in Review.objects.order_by().values(
+            'title', 'score'
+        ).annotate(count=Count('pk'))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_title_fts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.PositiveSmallIntegerField(validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(10)], verbose_name='Оценка')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Количество отзывов')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='scores', to='reviews.title', verbose_name='Произведение')),
+            ],
+            options={
+                'verbose_name': 'количество оценок',
+                'verbose_name_plural': 'распределение оценок',
+                'ordering': ('score',),
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='titlescore',
+            constraint=models.UniqueConstraint(fields=('title', 'score'), name='unique_title_score'),
+        ),
+        migrations.RunPython(fill_scores, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,83 @@
+# Generated by Django 3.2 on 2026-10-18 17:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def fill_rankings(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    Review = apps.get_model('reviews', 'Review')
+    TitleRanking = apps.get_model('reviews', 'TitleRanking')
+    DailyReviewCount = apps.get_model('reviews', 'DailyReviewCount')
+    TitleRanking.objects.bulk_create(
+        TitleRanking(
+            title_id=title.id, category_id=title.category_id,
+            rating=title.rating_sum / title.rating_count,
+            review_count=title.rating_count
+        )
+        for title in Title.objects.filter(rating_count__gt=0)
+    )
+    DailyReviewCount.objects.bulk_create(
+        DailyReviewCount(title_id=row['title'], day=row['day'],
+                         count=row['count'])
+        for row in Review.objects.order_by().annotate(
+            day=TruncDate('pub_date')
+        ).values('title', 'day').annotate(count=Count('pk'))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_titlescore'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleRanking',
+            fields=[
+                ('title', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='ranking', serialize=False, to='reviews.title', verbose_name='Произведение')),
+                ('rating', models.FloatField(null=True, verbose_name='Средняя оценка')),
+                ('review_count', models.PositiveIntegerField(default=0, verbose_name='Количество отзывов')),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='reviews.category', verbose_name='Категория')),
+            ],
+            options={
+                'verbose_name': 'рейтинг произведения',
+                'verbose_name_plural': 'рейтинг произведений',
+                'ordering': ('-rating', '-review_count', 'title_id'),
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyReviewCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='День')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Количество отзывов')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='reviews.title', verbose_name='Произведение')),
+            ],
+            options={
+                'verbose_name': 'отзывы за день',
+                'verbose_name_plural': 'отзывы по дням',
+                'ordering': ('-day',),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='titleranking',
+            index=models.Index(fields=['-rating', '-review_count'], name='ranking_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='titleranking',
+            index=models.Index(fields=['category', '-rating', '-review_count'], name='ranking_category_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dailyreviewcount',
+            index=models.Index(fields=['day', 'title', 'count'], name='daily_review_count_day_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='dailyreviewcount',
+            constraint=models.UniqueConstraint(fields=('title', 'day'), name='unique_title_day'),
+        ),
+        migrations.RunPython(fill_rankings, migrations.RunPython.noop),
+    ]
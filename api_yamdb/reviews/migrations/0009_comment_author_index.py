@@ -0,0 +1,17 @@
+# Generated by Django 3.2 on 2026-10-18 17:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0008_access_pattern_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['author', '-pub_date'], name='comment_author_pub_date_idx'),
+        ),
+    ]
@@ -1,9 +1,13 @@
+import re
 from datetime import datetime
 
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import IntegrityError, connection, models, transaction
+from django.db.models import (Count, F, FloatField, OuterRef, Q, Subquery,
+                              Sum)
+from django.db.models.functions import Cast, Coalesce, NullIf, TruncDate
 
 User = get_user_model()
 
@@ -13,6 +17,7 @@ MIN_SCORE = 1  # Минимальная оценка произведения
 MAX_SCORE = 10  # Максимальная оценка произведения
 MAX_LENGTH_NAME = 256  # Максимальная длина поля name
 MAX_LENGTH_SLUG = 50  # Максимальная длина поля slug
+TITLE_FTS_TABLE = 'reviews_title_fts'  # Полнотекстовый индекс произведений
 
 
 def validate_year_not_future(value):
@@ -54,6 +59,65 @@ class Genre(NameAndSlugBaseModel):
         verbose_name_plural = 'жанры'
 
 
+class TitleQuerySet(models.QuerySet):
+
+    def with_rating(self):
+        """Средняя оценка из хранимых суммы и количества оценок."""
+        return self.annotate(
+            rating=Cast('rating_sum', FloatField())
+            / NullIf(F('rating_count'), 0)
+        )
+
+    def recalculate_rating(self):
+        """Пересчитывает сумму и количество оценок по отзывам."""
+        reviews = Review.objects.filter(
+            title=OuterRef('pk')
+        ).order_by().values('title')
+        return self.update(
+            rating_sum=Coalesce(
+                Subquery(
+                    reviews.annotate(total=Sum('score')).values('total')
+                ), 0
+            ),
+            rating_count=Coalesce(
+                Subquery(
+                    reviews.annotate(total=Count('pk')).values('total')
+                ), 0
+            ),
+        )
+
+    def search(self, text):
+        """
+        Полнотекстовый поиск по названию и описанию.
+
+        На SQLite использует индекс FTS5 из миграции 0004 и сортирует
+        результаты по релевантности (bm25); слова запроса ищутся
+        как префиксы. На других СУБД — поиск по вхождению подстроки.
+        """
+        words = re.findall(r'\w+', text)
+        if not words:
+            return self.none()
+        if connection.vendor != 'sqlite':
+            condition = Q()
+            for word in words:
+                condition &= (
+                    Q(name__icontains=word) | Q(description__icontains=word)
+                )
+            return self.filter(condition)
+        match = ' '.join(f'"{word}"*' for word in words)
+        # Индекс присоединяется к выборке один раз: MATCH выполняется
+        # однократно, а bm25() читается из той же строки соединения.
+        return self.extra(
+            tables=[TITLE_FTS_TABLE],
+            where=[
+                f'{TITLE_FTS_TABLE} MATCH %s',
+                f'{TITLE_FTS_TABLE}.rowid = {Title._meta.db_table}.id',
+            ],
+            params=[match],
+            select={'search_rank': f'bm25({TITLE_FTS_TABLE})'},
+        ).order_by('search_rank', 'id')
+
+
 class Title(models.Model):
     name = models.CharField(
         max_length=MAX_LENGTH_NAME,
@@ -75,16 +139,61 @@ class Title(models.Model):
         verbose_name='Год выпуска',
         validators=(validate_year_not_future,)
     )
+    rating_sum = models.PositiveIntegerField(
+        'Сумма оценок', default=0, editable=False
+    )
+    rating_count = models.PositiveIntegerField(
+        'Количество оценок', default=0, editable=False
+    )
+
+    objects = TitleQuerySet.as_manager()
 
     class Meta:
         ordering = ('-year', 'name')
         verbose_name = 'произведение'
         verbose_name_plural = 'произведения'
+        indexes = (
+            models.Index(fields=('-year', 'name'), name='title_year_name_idx'),
+        )
 
     def __str__(self):
         return self.name[:RETURN_TEXT_LEN]
 
 
+class AuthoredQuerySet(models.QuerySet):
+
+    def with_author(self):
+        """
+        Присоединяет автора в том же запросе, загружая из users_user
+        только id и username.
+        """
+        return self.select_related('author').only(
+            *(field.name for field in self.model._meta.concrete_fields),
+            'author__username'
+        )
+
+
+class ReviewQuerySet(AuthoredQuerySet):
+
+    def recalculate_comments_count(self):
+        """Пересчитывает количество комментариев к отзывам."""
+        return self.update(comments_count=Coalesce(
+            Subquery(
+                Comment.objects.filter(review=OuterRef('pk')).order_by(
+                ).values('review').annotate(total=Count('pk')).values('total')
+            ), 0
+        ))
+
+    def lock_score(self, pk):
+        """
+        Блокирует строку отзыва до конца транзакции и возвращает её
+        оценку из базы; None, если отзыва уже нет.
+        """
+        if not self.filter(pk=pk).update(score=F('score')):
+            return None
+        return self.filter(pk=pk).values_list('score', flat=True).get()
+
+
 class Review(models.Model):
     text = models.TextField('Текст отзыва')
     author = models.ForeignKey(User, on_delete=models.CASCADE,
@@ -97,6 +206,11 @@ class Review(models.Model):
         validators=(MinValueValidator(MIN_SCORE), MaxValueValidator(MAX_SCORE))
     )
     pub_date = models.DateTimeField('Дата пуликации', auto_now_add=True)
+    comments_count = models.PositiveIntegerField(
+        'Количество комментариев', default=0, editable=False
+    )
+
+    objects = ReviewQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'отзыв'
@@ -108,10 +222,39 @@ class Review(models.Model):
                 name='unique_title_author'
             ),
         )
+        indexes = (
+            models.Index(fields=('title', '-pub_date'),
+                         name='review_title_pub_date_idx'),
+            models.Index(fields=('author', '-pub_date'),
+                         name='review_author_pub_date_idx'),
+        )
 
     def __str__(self):
         return self.text[:RETURN_TEXT_LEN]
 
+    def save(self, *args, **kwargs):
+        # Агрегаты произведения меняются в той же транзакции
+        # (см. reviews/signals.py).
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+
+class CommentQuerySet(AuthoredQuerySet):
+
+    def latest_for_reviews(self, review_ids, limit):
+        """
+        Последние `limit` комментариев каждого из отзывов одним запросом.
+
+        Коррелированный подзапрос с LIMIT выбирает id комментариев
+        отдельно для каждого отзыва, как LATERAL-соединение.
+        """
+        latest = Comment.objects.filter(
+            review_id=OuterRef('review_id')
+        ).order_by('-pub_date', '-id').values('pk')[:limit]
+        return self.filter(
+            review_id__in=review_ids, pk__in=latest
+        ).order_by('review_id', '-pub_date', '-id')
+
 
 class Comment(models.Model):
     text = models.TextField('Текст')
@@ -122,10 +265,195 @@ class Comment(models.Model):
                                verbose_name='Отзыв')
     pub_date = models.DateTimeField('Дата пуликации', auto_now_add=True)
 
+    objects = CommentQuerySet.as_manager()
+
     class Meta:
         verbose_name = 'комментарий'
         verbose_name_plural = 'комментарии'
         ordering = ('-pub_date',)
+        indexes = (
+            models.Index(fields=('review', '-pub_date'),
+                         name='comment_review_pub_date_idx'),
+            models.Index(fields=('author', '-pub_date'),
+                         name='comment_author_pub_date_idx'),
+        )
 
     def __str__(self):
         return self.text[:RETURN_TEXT_LEN]
+
+
+class UpsertQuerySet(models.QuerySet):
+
+    def upsert(self, update, create, **key):
+        """
+        Обновляет строку с ключом `key` или создаёт её.
+
+        Гонка двух вставок разрешается уникальным ограничением:
+        проигравшая вставка повторяет UPDATE.
+        """
+        rows = self.filter(**key)
+        if rows.update(**update):
+            return
+        try:
+            with transaction.atomic():
+                self.create(**key, **create)
+        except IntegrityError:
+            rows.update(**update)
+
+    def change(self, delta, **key):
+        """Атомарно изменяет счётчик `count` строки с ключом `key`."""
+        if delta < 0:
+            self.filter(**key).update(count=F('count') + delta)
+        else:
+            self.upsert({'count': F('count') + delta}, {'count': delta}, **key)
+
+
+class TitleScoreQuerySet(UpsertQuerySet):
+
+    def rebuild(self, titles):
+        """Пересобирает гистограммы оценок произведений по отзывам."""
+        self.filter(title__in=titles).delete()
+        return self.bulk_create(
+            self.model(title_id=row['title'], score=row['score'],
+                       count=row['count'])
+            for row in Review.objects.filter(title__in=titles).order_by(
+            ).values('title', 'score').annotate(count=Count('pk'))
+        )
+
+
+class TitleScore(models.Model):
+    title = models.ForeignKey(Title, on_delete=models.CASCADE,
+                              related_name='scores',
+                              verbose_name='Произведение')
+    score = models.PositiveSmallIntegerField(
+        'Оценка',
+        validators=(MinValueValidator(MIN_SCORE), MaxValueValidator(MAX_SCORE))
+    )
+    count = models.PositiveIntegerField('Количество отзывов', default=0)
+
+    objects = TitleScoreQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = 'количество оценок'
+        verbose_name_plural = 'распределение оценок'
+        ordering = ('score',)
+        constraints = (
+            models.UniqueConstraint(
+                fields=('title', 'score'),
+                name='unique_title_score'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.score}: {self.count}'
+
+
+class TitleRankingQuerySet(UpsertQuerySet):
+
+    def refresh(self, title_ids, create=True):
+        """
+        Переносит рейтинг произведений из Title в таблицу рейтинга.
+
+        При удалении отзывов строки только обновляются: произведение
+        может удаляться в той же транзакции.
+        """
+        titles = Title.objects.filter(pk__in=title_ids).values(
+            'id', 'category_id', 'rating_sum', 'rating_count'
+        )
+        for title in titles:
+            values = {
+                'category_id': title['category_id'],
+                'rating': (
+                    title['rating_sum'] / title['rating_count']
+                    if title['rating_count'] else None
+                ),
+                'review_count': title['rating_count'],
+            }
+            if create:
+                self.upsert(values, values, title_id=title['id'])
+            else:
+                self.filter(title_id=title['id']).update(**values)
+
+    def rebuild(self):
+        self.all().delete()
+        return self.bulk_create(
+            self.model(
+                title_id=title.id, category_id=title.category_id,
+                rating=title.rating_sum / title.rating_count,
+                review_count=title.rating_count
+            )
+            for title in Title.objects.filter(rating_count__gt=0).only(
+                'category_id', 'rating_sum', 'rating_count'
+            )
+        )
+
+
+class TitleRanking(models.Model):
+    """Материализованный рейтинг произведений для /titles/top/."""
+
+    title = models.OneToOneField(Title, on_delete=models.CASCADE,
+                                 primary_key=True, related_name='ranking',
+                                 verbose_name='Произведение')
+    category = models.ForeignKey(Category, on_delete=models.CASCADE,
+                                 related_name='+', verbose_name='Категория')
+    rating = models.FloatField('Средняя оценка', null=True)
+    review_count = models.PositiveIntegerField('Количество отзывов',
+                                               default=0)
+
+    objects = TitleRankingQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = 'рейтинг произведения'
+        verbose_name_plural = 'рейтинг произведений'
+        ordering = ('-rating', '-review_count', 'title_id')
+        indexes = (
+            models.Index(fields=('-rating', '-review_count'),
+                         name='ranking_rating_idx'),
+            models.Index(fields=('category', '-rating', '-review_count'),
+                         name='ranking_category_rating_idx'),
+        )
+
+    def __str__(self):
+        return f'{self.title_id}: {self.rating}'
+
+
+class DailyReviewCountQuerySet(UpsertQuerySet):
+
+    def rebuild(self):
+        self.all().delete()
+        return self.bulk_create(
+            self.model(title_id=row['title'], day=row['day'],
+                       count=row['count'])
+            for row in Review.objects.order_by().annotate(
+                day=TruncDate('pub_date')
+            ).values('title', 'day').annotate(count=Count('pk'))
+        )
+
+
+class DailyReviewCount(models.Model):
+    """Количество отзывов на произведение за день для /titles/trending/."""
+
+    title = models.ForeignKey(Title, on_delete=models.CASCADE,
+                              related_name='+', verbose_name='Произведение')
+    day = models.DateField('День')
+    count = models.PositiveIntegerField('Количество отзывов', default=0)
+
+    objects = DailyReviewCountQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = 'отзывы за день'
+        verbose_name_plural = 'отзывы по дням'
+        ordering = ('-day',)
+        constraints = (
+            models.UniqueConstraint(
+                fields=('title', 'day'),
+                name='unique_title_day'
+            ),
+        )
+        indexes = (
+            models.Index(fields=('day', 'title', 'count'),
+                         name='daily_review_count_day_idx'),
+        )
+
+    def __str__(self):
+        return f'{self.day}: {self.count}'
@@ -0,0 +1,92 @@
+from django.db.models import F
+from django.db.models.signals import (post_delete, post_save, pre_delete,
+                                      pre_save)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .aggregates import add_reviews
+from .models import (Comment, DailyReviewCount, Review, Title, TitleRanking,
+                     TitleScore)
+
+
+@receiver(pre_save, sender=Review)
+@receiver(pre_delete, sender=Review)
+def lock_review_score(sender, instance, raw=False, **kwargs):
+    """
+    Запоминает оценку отзыва, сохранённую в базе.
+
+    Review.save() и удаление выполняются в транзакции, а строка отзыва
+    блокируется до её конца, поэтому параллельное изменение того же
+    отзыва не приведёт к расчёту разницы от устаревшей оценки.
+    """
+    instance._stored_score = None
+    if not raw and not instance._state.adding:
+        instance._stored_score = Review.objects.lock_score(instance.pk)
+
+
+@receiver(post_save, sender=Review)
+def update_scores_on_save(sender, instance, created, raw=False, **kwargs):
+    """
+    Обновляет рейтинг, гистограмму оценок и таблицы рейтингов.
+
+    Каждое изменение — UPDATE с F-выражением по одной строке, без
+    пересчёта агрегатов по всем отзывам.
+    """
+    if raw:
+        return
+    if created:
+        add_reviews([instance])
+    elif instance._stored_score not in (None, instance.score):
+        Title.objects.filter(pk=instance.title_id).update(
+            rating_sum=(
+                F('rating_sum') - instance._stored_score + instance.score
+            )
+        )
+        TitleScore.objects.change(
+            -1, title_id=instance.title_id, score=instance._stored_score
+        )
+        TitleScore.objects.change(
+            1, title_id=instance.title_id, score=instance.score
+        )
+        TitleRanking.objects.refresh([instance.title_id])
+
+
+@receiver(post_delete, sender=Review)
+def update_scores_on_delete(sender, instance, **kwargs):
+    if instance._stored_score is None:
+        return
+    Title.objects.filter(pk=instance.title_id).update(
+        rating_sum=F('rating_sum') - instance._stored_score,
+        rating_count=F('rating_count') - 1
+    )
+    TitleScore.objects.change(
+        -1, title_id=instance.title_id, score=instance._stored_score
+    )
+    DailyReviewCount.objects.change(
+        -1, title_id=instance.title_id,
+        day=timezone.localdate(instance.pub_date)
+    )
+    TitleRanking.objects.refresh([instance.title_id], create=False)
+
+
+@receiver(post_save, sender=Title)
+def update_ranking_category(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw:
+        TitleRanking.objects.filter(title=instance).update(
+            category_id=instance.category_id
+        )
+
+
+@receiver(post_save, sender=Comment)
+def increment_comments_count(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        Review.objects.filter(pk=instance.review_id).update(
+            comments_count=F('comments_count') + 1
+        )
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comments_count(sender, instance, **kwargs):
+    Review.objects.filter(pk=instance.review_id).update(
+        comments_count=F('comments_count') - 1
+    )
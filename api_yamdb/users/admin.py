@@ -3,6 +3,8 @@ from django.contrib.auth import get_user_model
 from django.contrib.auth.admin import UserAdmin
 from django.contrib.auth.models import Group
 
+from .models import OutgoingEmail
+
 User = get_user_model()
 
 
@@ -27,3 +29,12 @@ class ModifiedUserAdmin(UserAdmin):
     @admin.display(description='Кол-во комментариев')
     def comment_count(self, obj):
         return obj.comments.count()
+
+
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = (
+        'recipient', 'subject', 'created', 'attempts', 'next_attempt'
+    )
+    search_fields = ('recipient',)
+    readonly_fields = ('created',)
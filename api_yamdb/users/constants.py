@@ -2,3 +2,8 @@ MAX_NAME_LENGTH = 150
 MAX_EMAIL_LENGTH = 254
 MAX_ROLE_LENGTH = 20
 MAX_CODE_LENGTH = 30
+MAX_SUBJECT_LENGTH = 255
+CONFIRMATION_CODE_LENGTH = 6
+CONFIRMATION_CODE_TTL = 15 * 60
+MAX_CONFIRMATION_ATTEMPTS = 5
+CONFIRMATION_LOCKOUT = 60 * 60
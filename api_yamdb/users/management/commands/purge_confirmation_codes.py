@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from users.models import ConfirmationCode
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет просроченные коды подтверждения и коды с исчерпанными '
+        'попытками. Рассчитана на периодический запуск.'
+    )
+
+    def handle(self, *args, **options):
+        deleted, _ = ConfirmationCode.objects.purge()
+        self.stdout.write(self.style.SUCCESS(f'Удалено кодов: {deleted}'))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from users.models import RevokedToken
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет записи об отозванных refresh-токенах, срок действия '
+        'которых истёк. Рассчитана на периодический запуск.'
+    )
+
+    def handle(self, *args, **options):
+        deleted, _ = RevokedToken.objects.purge()
+        self.stdout.write(self.style.SUCCESS(f'Удалено токенов: {deleted}'))
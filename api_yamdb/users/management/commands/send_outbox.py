@@ -0,0 +1,124 @@
+import time
+from datetime import timedelta
+from smtplib import SMTPException
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from users.models import OutgoingEmail
+
+MAIL_ERRORS = (SMTPException, OSError)
+
+
+class Command(BaseCommand):
+    help = (
+        'Отправляет письма из очереди OutgoingEmail пачками через одно '
+        'соединение с почтовым сервером. Неотправленные письма '
+        'повторяются с экспоненциальной задержкой. Перед отправкой '
+        'пачка занимается переносом next_attempt на claim_timeout '
+        'секунд, поэтому параллельные запуски не отправляют одно '
+        'письмо дважды.'
+    )
+
+    retry_delay = 30
+    claim_timeout = 15 * 60
+    max_retry_delay = 60 * 60
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--max-attempts', type=int, default=5)
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Не завершаться, а ждать новых писем.'
+        )
+        parser.add_argument(
+            '--interval', type=float, default=5,
+            help='Пауза в секундах между проверками очереди в режиме --loop.'
+        )
+
+    def handle(self, *args, **options):
+        connection = get_connection(fail_silently=False)
+        sent = failed = purged = 0
+        try:
+            while True:
+                purged += OutgoingEmail.objects.purge(
+                    options['max_attempts']
+                )[0]
+                batch = list(OutgoingEmail.objects.filter(
+                    next_attempt__lte=timezone.now(),
+                    attempts__lt=options['max_attempts']
+                )[:options['batch_size']])
+                if batch:
+                    batch = self.claim(batch)
+                    batch_sent, batch_failed = self.send_batch(
+                        connection, batch
+                    )
+                    sent += batch_sent
+                    failed += batch_failed
+                elif options['loop']:
+                    connection.close()
+                    time.sleep(options['interval'])
+                else:
+                    break
+        finally:
+            connection.close()
+        self.stdout.write(self.style.SUCCESS(
+            f'Отправлено писем: {sent}, отложено: {failed}, '
+            f'удалено без отправки: {purged}'
+        ))
+
+    def claim(self, emails):
+        """
+        Занимает письма, которые не успел занять другой запуск.
+
+        next_attempt письма меняется, только если он не изменился с
+        момента выборки. Если запуск прервётся, письма снова станут
+        доступны через claim_timeout секунд.
+        """
+        claimed_until = timezone.now() + timedelta(
+            seconds=self.claim_timeout
+        )
+        claimed = []
+        for email in emails:
+            if OutgoingEmail.objects.filter(
+                pk=email.pk, next_attempt=email.next_attempt
+            ).update(next_attempt=claimed_until):
+                email.next_attempt = claimed_until
+                claimed.append(email)
+        return claimed
+
+    def send_batch(self, connection, emails):
+        sent_ids = []
+        failed = []
+        for email in emails:
+            try:
+                # Открытое соединение send_messages не закрывает.
+                connection.open()
+                connection.send_messages([EmailMessage(
+                    subject=email.subject,
+                    body=email.body,
+                    from_email=settings.EMAIL_HOST_USER,
+                    to=[email.recipient],
+                )])
+            except MAIL_ERRORS as error:
+                self.postpone(email, error)
+                failed.append(email)
+                connection.close()
+            else:
+                sent_ids.append(email.pk)
+        OutgoingEmail.objects.filter(pk__in=sent_ids).delete()
+        OutgoingEmail.objects.bulk_update(
+            failed, ('attempts', 'next_attempt', 'last_error')
+        )
+        return len(sent_ids), len(failed)
+
+    def postpone(self, email, error):
+        email.attempts += 1
+        delay = min(
+            self.retry_delay * 2 ** (email.attempts - 1),
+            self.max_retry_delay
+        )
+        email.next_attempt = timezone.now() + timedelta(seconds=delay)
+        email.last_error = str(error) or type(error).__name__
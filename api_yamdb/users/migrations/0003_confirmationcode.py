@@ -0,0 +1,27 @@
+# Generated by Django 3.2 on 2026-10-18 17:27
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_outgoingemail'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConfirmationCode',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='otp', serialize=False, to='users.user', verbose_name='Пользователь')),
+                ('code_hash', models.CharField(max_length=64, verbose_name='Хеш кода')),
+                ('expires', models.DateTimeField(db_index=True, verbose_name='Действует до')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Неверных попыток')),
+            ],
+            options={
+                'verbose_name': 'код подтверждения',
+                'verbose_name_plural': 'коды подтверждения',
+            },
+        ),
+    ]
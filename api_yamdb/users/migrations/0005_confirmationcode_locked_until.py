@@ -0,0 +1,18 @@
+# Generated by Django 3.2 on 2026-10-18 17:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_revokedtoken'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='confirmationcode',
+            name='locked_until',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Заблокирован до'),
+        ),
+    ]
@@ -1,11 +1,19 @@
+import secrets
+from datetime import datetime, timedelta, timezone as dt_timezone
+
 from django.contrib.auth.base_user import BaseUserManager
 from django.contrib.auth.models import AbstractUser
 from django.contrib.auth.validators import UnicodeUsernameValidator
 from django.core.exceptions import ValidationError
-from django.db import models, transaction
+from django.db import IntegrityError, models, transaction
+from django.db.models import Case, F, Q, Value, When
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare, salted_hmac
 
-from .constants import (MAX_CODE_LENGTH, MAX_EMAIL_LENGTH, MAX_NAME_LENGTH,
-                        MAX_ROLE_LENGTH)
+from .constants import (CONFIRMATION_CODE_LENGTH, CONFIRMATION_CODE_TTL,
+                        CONFIRMATION_LOCKOUT, MAX_CODE_LENGTH,
+                        MAX_CONFIRMATION_ATTEMPTS, MAX_EMAIL_LENGTH,
+                        MAX_NAME_LENGTH, MAX_ROLE_LENGTH, MAX_SUBJECT_LENGTH)
 from .validators import username_is_not_me
 
 
@@ -116,3 +124,218 @@ class User(AbstractUser):
     class Meta:
         verbose_name = 'Пользователь'
         verbose_name_plural = 'Пользователи'
+
+
+class OutgoingEmailQuerySet(models.QuerySet):
+
+    def purge(self, max_attempts):
+        """
+        Удаляет письма, которые уже не будут отправлены: с исчерпанными
+        попытками или старше CONFIRMATION_CODE_TTL, когда код в письме
+        всё равно истёк.
+        """
+        return self.filter(
+            Q(attempts__gte=max_attempts)
+            | Q(created__lt=timezone.now() - timedelta(
+                seconds=CONFIRMATION_CODE_TTL
+            ))
+        ).delete()
+
+
+class OutgoingEmail(models.Model):
+    """
+    Письмо в очереди на отправку.
+
+    Запрос только добавляет строку, а отправляет письма команда
+    `send_outbox`; отправленные письма удаляются из очереди, как и
+    письма, которые отправлять уже поздно (см. purge()).
+    """
+
+    recipient = models.EmailField('Получатель', max_length=MAX_EMAIL_LENGTH)
+    subject = models.CharField('Тема', max_length=MAX_SUBJECT_LENGTH)
+    body = models.TextField('Текст')
+    created = models.DateTimeField('Создано', auto_now_add=True)
+    attempts = models.PositiveSmallIntegerField('Попыток отправки', default=0)
+    next_attempt = models.DateTimeField(
+        'Следующая попытка', default=timezone.now
+    )
+    last_error = models.TextField('Последняя ошибка', blank=True)
+
+    objects = OutgoingEmailQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = 'исходящее письмо'
+        verbose_name_plural = 'исходящие письма'
+        ordering = ('next_attempt', 'id')
+        indexes = (
+            models.Index(fields=('next_attempt', 'attempts'),
+                         name='outgoing_email_due_idx'),
+        )
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'
+
+
+class ConfirmationCodeQuerySet(models.QuerySet):
+
+    def issue(self, user):
+        """
+        Создаёт новый код пользователя, заменяя прежний.
+
+        Счётчик неверных попыток при этом сохраняется и сбрасывается
+        только после окончания блокировки: иначе повторная регистрация
+        давала бы новые попытки подбора.
+        """
+        code = str(secrets.randbelow(10 ** CONFIRMATION_CODE_LENGTH)).zfill(
+            CONFIRMATION_CODE_LENGTH
+        )
+        now = timezone.now()
+        values = {
+            'code_hash': ConfirmationCode.make_hash(user.pk, code),
+            'expires': now + timedelta(seconds=CONFIRMATION_CODE_TTL),
+        }
+        unlocked = Q(locked_until__lt=now)
+        # Сначала UPDATE: в SQLite он сразу берёт блокировку на запись,
+        # а гонку вставок разрешает первичный ключ.
+        rows = self.filter(user=user)
+        update = {
+            **values,
+            'attempts': Case(
+                When(unlocked, then=Value(0)), default=F('attempts'),
+                output_field=models.PositiveSmallIntegerField()
+            ),
+            'locked_until': Case(
+                When(unlocked, then=Value(
+                    None, output_field=models.DateTimeField()
+                )),
+                default=F('locked_until')
+            ),
+        }
+        if not rows.update(**update):
+            try:
+                with transaction.atomic():
+                    self.create(user=user, **values)
+            except IntegrityError:
+                rows.update(**update)
+        return code
+
+    def purge(self):
+        """
+        Удаляет коды, истёкшие больше CONFIRMATION_LOCKOUT секунд назад:
+        к этому времени закончилась и любая блокировка.
+        """
+        return self.filter(expires__lt=timezone.now() - timedelta(
+            seconds=CONFIRMATION_LOCKOUT
+        )).delete()
+
+
+class ConfirmationCode(models.Model):
+    """
+    Одноразовый код подтверждения.
+
+    У пользователя не больше одного кода; в базе хранится только
+    HMAC кода. Код действует CONFIRMATION_CODE_TTL секунд; после
+    MAX_CONFIRMATION_ATTEMPTS неверных попыток пользователь блокируется
+    на CONFIRMATION_LOCKOUT секунд, в том числе для новых кодов.
+    """
+
+    user = models.OneToOneField(
+        User, on_delete=models.CASCADE, primary_key=True,
+        related_name='otp', verbose_name='Пользователь'
+    )
+    code_hash = models.CharField('Хеш кода', max_length=64)
+    expires = models.DateTimeField('Действует до', db_index=True)
+    attempts = models.PositiveSmallIntegerField('Неверных попыток', default=0)
+    locked_until = models.DateTimeField(
+        'Заблокирован до', blank=True, null=True
+    )
+
+    objects = ConfirmationCodeQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = 'код подтверждения'
+        verbose_name_plural = 'коды подтверждения'
+
+    def __str__(self):
+        return f'{self.user_id}: {self.expires}'
+
+    @staticmethod
+    def make_hash(user_id, code):
+        return salted_hmac(
+            'users.ConfirmationCode', f'{user_id}:{code}',
+            algorithm='sha256'
+        ).hexdigest()
+
+    def verify(self, code):
+        """
+        Проверяет код.
+
+        Просроченный код и код с исчерпанными попытками отклоняются без
+        сравнения. Перед сравнением попытка списывается условным UPDATE,
+        поэтому параллельные запросы не превысят лимит; последняя
+        попытка блокирует код на CONFIRMATION_LOCKOUT секунд. Верный
+        код удаляется.
+        """
+        now = timezone.now()
+        if self.expires < now or self.attempts >= MAX_CONFIRMATION_ATTEMPTS:
+            return False
+        codes = ConfirmationCode.objects.filter(
+            pk=self.pk, code_hash=self.code_hash
+        )
+        reserved = codes.filter(
+            expires__gte=now, attempts__lt=MAX_CONFIRMATION_ATTEMPTS
+        ).update(
+            attempts=F('attempts') + 1,
+            locked_until=Case(
+                When(
+                    attempts=MAX_CONFIRMATION_ATTEMPTS - 1,
+                    then=Value(now + timedelta(seconds=CONFIRMATION_LOCKOUT))
+                ),
+                default=F('locked_until')
+            )
+        )
+        if not reserved or not constant_time_compare(
+            self.code_hash, self.make_hash(self.user_id, str(code))
+        ):
+            return False
+        # Условие на хеш не даст использовать код дважды параллельно.
+        deleted, _ = codes.delete()
+        return bool(deleted)
+
+
+class RevokedTokenQuerySet(models.QuerySet):
+
+    def revoke(self, token):
+        """
+        Отзывает refresh-токен. Вставка по первичному ключу jti сразу
+        проверяет, не был ли токен отозван раньше: тогда возвращает False.
+        """
+        try:
+            with transaction.atomic():
+                self.create(jti=token['jti'], expires=datetime.fromtimestamp(
+                    token['exp'], tz=dt_timezone.utc
+                ))
+        except IntegrityError:
+            return False
+        return True
+
+    def purge(self):
+        """Удаляет записи о токенах, срок которых всё равно истёк."""
+        return self.filter(expires__lt=timezone.now()).delete()
+
+
+class RevokedToken(models.Model):
+    """Отозванный при ротации refresh-токен."""
+
+    jti = models.CharField('Идентификатор токена', max_length=255,
+                           primary_key=True)
+    expires = models.DateTimeField('Истекает', db_index=True)
+
+    objects = RevokedTokenQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = 'отозванный токен'
+        verbose_name_plural = 'отозванные токены'
+
+    def __str__(self):
+        return self.jti
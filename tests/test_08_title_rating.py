@@ -0,0 +1,187 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+    SCORES_URL_TEMPLATE = '/api/v1/titles/{title_id}/scores/'
+
+    def get_rating(self, client, title_id):
+        response = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.status_code == HTTPStatus.OK
+        return response.json().get('rating')
+
+    def test_01_rating_follows_review_writes(self, client, admin_client,
+                                             admin, user_client, user):
+        author_map = {admin: admin_client, user: user_client}
+        reviews, titles = create_reviews(admin_client, author_map)
+        title_id = titles[0]['id']
+        assert self.get_rating(client, title_id) == 5, (
+            'Проверьте, что рейтинг произведения учитывает новые отзывы.'
+        )
+
+        user_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[1]['id']
+            ),
+            data={'score': 1}
+        )
+        assert self.get_rating(client, title_id) == 3, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'изменении оценки в отзыве.'
+        )
+
+        user_client.delete(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[1]['id']
+            )
+        )
+        assert self.get_rating(client, title_id) == 5, (
+            'Проверьте, что рейтинг произведения пересчитывается при '
+            'удалении отзыва.'
+        )
+
+        admin_client.delete(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[0]['id']
+            )
+        )
+        assert self.get_rating(client, title_id) is None, (
+            'Проверьте, что у произведения без отзывов рейтинг равен `None`.'
+        )
+
+    def test_02_recalculate_ratings_command(self, client, admin_client,
+                                            admin, user_client, user):
+        from reviews.models import Title
+
+        author_map = {admin: admin_client, user: user_client}
+        _, titles = create_reviews(admin_client, author_map)
+        Title.objects.update(rating_sum=0, rating_count=0)
+
+        call_command('recalculate_ratings')
+
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.rating_sum, title.rating_count) == (10, 2), (
+            'Проверьте, что команда `recalculate_ratings` восстанавливает '
+            'сумму и количество оценок по отзывам.'
+        )
+        assert self.get_rating(client, titles[1]['id']) is None
+
+    def test_03_score_histogram(self, client, admin_client, admin,
+                                user_client, user, moderator,
+                                moderator_client,
+                                django_assert_num_queries):
+        from reviews.models import TitleScore
+
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        reviews, titles = create_reviews(admin_client, author_map)
+        url = self.SCORES_URL_TEMPLATE.format(title_id=titles[0]['id'])
+
+        with django_assert_num_queries(2):
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает ответ со '
+            'статусом 200.'
+        )
+        histogram = {item['score']: item['count'] for item in response.json()}
+        assert histogram == {score: 0 for score in range(1, 11)} | {5: 3}, (
+            f'Проверьте, что `{url}` возвращает количество отзывов для '
+            'каждой оценки от 1 до 10.'
+        )
+
+        user_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=titles[0]['id'], review_id=reviews[1]['id']
+            ),
+            data={'score': 9}
+        )
+        admin_client.delete(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=titles[0]['id'], review_id=reviews[0]['id']
+            )
+        )
+        histogram = {
+            item['score']: item['count'] for item in client.get(url).json()
+        }
+        assert (histogram[5], histogram[9]) == (1, 1), (
+            'Проверьте, что распределение оценок обновляется при изменении '
+            'и удалении отзывов.'
+        )
+
+        TitleScore.objects.all().delete()
+        call_command('recalculate_ratings')
+        assert {
+            item['score']: item['count'] for item in client.get(url).json()
+        } == histogram, (
+            'Проверьте, что команда `recalculate_ratings` восстанавливает '
+            'распределение оценок.'
+        )
+
+        response = client.get(self.SCORES_URL_TEMPLATE.format(title_id=999))
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_04_overlapping_review_writes(self, admin_client, admin,
+                                          user_client, user):
+        from django.db.models import Count, Sum
+        from reviews.models import Review, Title, TitleScore
+
+        reviews, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        title_id = titles[0]['id']
+
+        def stored():
+            title = Title.objects.get(pk=title_id)
+            return (
+                (title.rating_sum, title.rating_count),
+                dict(TitleScore.objects.filter(
+                    title_id=title_id, count__gt=0
+                ).values_list('score', 'count'))
+            )
+
+        def actual():
+            rows = Review.objects.filter(title_id=title_id)
+            return (
+                (rows.aggregate(total=Sum('score'))['total'] or 0,
+                 rows.count()),
+                dict(rows.order_by().values('score').annotate(
+                    count=Count('pk')
+                ).values_list('score', 'count'))
+            )
+
+        first, second = (
+            Review.objects.get(pk=reviews[0]['id']) for _ in range(2)
+        )
+        first.score = 1
+        first.save()
+        second.score = 10
+        second.save()
+        assert stored() == actual(), (
+            'Проверьте, что при сохранении устаревшего экземпляра отзыва '
+            'разница оценок считается от оценки, сохранённой в базе.'
+        )
+
+        first, second = (
+            Review.objects.get(pk=reviews[0]['id']) for _ in range(2)
+        )
+        first.delete()
+        second.delete()
+        assert stored() == actual(), (
+            'Проверьте, что повторное удаление отзыва не уменьшает '
+            'агрегаты произведения дважды.'
+        )
@@ -0,0 +1,77 @@
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09TitleQueries:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    # COUNT, страница произведений с категориями, жанры страницы.
+    LIST_QUERY_BUDGET = 3
+    # Произведение с категорией, жанры произведения.
+    DETAIL_QUERY_BUDGET = 2
+
+    def create_more_titles(self, admin_client, genres, categories):
+        for year in range(1990, 2000):
+            admin_client.post(self.TITLES_URL, data={
+                'name': f'Произведение {year}',
+                'year': year,
+                'genre': [genre['slug'] for genre in genres],
+                'category': categories[year % 2]['slug'],
+            })
+
+    def test_01_title_list_query_budget(self, client, admin_client,
+                                        django_assert_num_queries):
+        titles, categories, genres = create_titles(admin_client)
+        self.create_more_titles(admin_client, genres, categories)
+
+        with django_assert_num_queries(self.LIST_QUERY_BUDGET):
+            response = client.get(self.TITLES_URL)
+        assert response.json()['results'], (
+            f'Проверьте, что GET-запрос к `{self.TITLES_URL}` возвращает '
+            'список произведений.'
+        )
+
+        with django_assert_num_queries(self.LIST_QUERY_BUDGET):
+            client.get(self.TITLES_URL, {'page': 2})
+
+    def test_02_title_detail_query_budget(self, client, admin_client,
+                                          django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+
+        with django_assert_num_queries(self.DETAIL_QUERY_BUDGET):
+            response = client.get(
+                self.TITLES_DETAIL_URL_TEMPLATE.format(
+                    title_id=titles[0]['id']
+                )
+            )
+        assert len(response.json()['genre']) == len(titles[0]['genre'])
+
+    def test_03_fast_serializer_matches_model_serializer(
+        self, client, admin_client, user_client
+    ):
+        from api.serializers import TitleSerializerRead
+        from reviews.models import Title
+
+        titles, _, _ = create_titles(admin_client)
+        user_client.post(
+            f'{self.TITLES_URL}{titles[0]["id"]}/reviews/',
+            data={'text': 'Отзыв', 'score': 7}
+        )
+        expected = TitleSerializerRead(
+            Title.objects.with_rating().order_by(*Title._meta.ordering),
+            many=True
+        ).data
+        response = client.get(self.TITLES_URL)
+        assert response.json()['results'] == expected, (
+            f'Проверьте, что ответ `{self.TITLES_URL}` совпадает с '
+            'результатом TitleSerializerRead.'
+        )
+        response = client.get(
+            self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        )
+        assert response.json() == next(
+            title for title in expected if title['id'] == titles[0]['id']
+        )
@@ -0,0 +1,114 @@
+from base64 import urlsafe_b64encode
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_reviews, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10CursorPagination:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def walk(self, client, url, key='next'):
+        ids = []
+        while url:
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что GET-запрос к `{url}` с параметром `cursor` '
+                'возвращает ответ со статусом 200.'
+            )
+            data = response.json()
+            assert 'count' not in data, (
+                'Проверьте, что в режиме `cursor` не выполняется подсчёт '
+                'количества объектов.'
+            )
+            ids.extend(item['id'] for item in data['results'])
+            url = data[key]
+        return ids
+
+    def test_01_titles_cursor_matches_page_numbers(self, client,
+                                                   admin_client):
+        _, categories, genres = create_titles(admin_client)
+        for number in range(11):
+            admin_client.post(self.TITLES_URL, data={
+                'name': f'Произведение {number % 3}',
+                'year': 2000 + number % 2,
+                'genre': [genres[0]['slug']],
+                'category': categories[0]['slug'],
+            })
+        expected = []
+        url = self.TITLES_URL
+        while url:
+            data = client.get(url).json()
+            expected.extend(item['id'] for item in data['results'])
+            url = data['next']
+
+        ids = self.walk(client, f'{self.TITLES_URL}?cursor=')
+        assert ids == expected, (
+            f'Проверьте, что в режиме `cursor` эндпоинт `{self.TITLES_URL}` '
+            'возвращает произведения в том же порядке и без пропусков.'
+        )
+
+        response = client.get(f'{self.TITLES_URL}?cursor=')
+        last_page = None
+        url = response.json()['next']
+        while url:
+            last_page = url
+            url = client.get(url).json()['next']
+        response = client.get(last_page)
+        backwards = self.walk(client, response.json()['previous'], 'previous')
+        assert len(backwards) == len(expected) - len(
+            response.json()['results']
+        ), (
+            'Проверьте, что ссылки `previous` в режиме `cursor` ведут '
+            'к предыдущим страницам.'
+        )
+
+    def test_02_reviews_cursor(self, client, admin_client, admin, user,
+                               user_client, moderator, moderator_client):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        reviews, titles = create_reviews(admin_client, author_map)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+
+        ids = self.walk(client, f'{url}?cursor=')
+        assert ids == [review['id'] for review in reversed(reviews)], (
+            f'Проверьте, что в режиме `cursor` эндпоинт `{url}` возвращает '
+            'отзывы от новых к старым.'
+        )
+
+    def test_03_invalid_cursor(self, client):
+        response = client.get(f'{self.TITLES_URL}?cursor=broken')
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что при некорректном значении `cursor` возвращается '
+            'ответ со статусом 404.'
+        )
+        for position in (
+            '[1e400, "a", 1]', f'[{10 ** 30}, "a", 1]', '[[1], "a", 1]',
+            '[{"a": 1}, "a", 1]'
+        ):
+            cursor = urlsafe_b64encode(
+                f'{{"p": {position}}}'.encode()
+            ).decode()
+            response = client.get(self.TITLES_URL, {'cursor': cursor})
+            assert response.status_code == HTTPStatus.NOT_FOUND, (
+                'Проверьте, что курсор со значениями, которые нельзя '
+                'передать в запрос к базе, возвращает ответ со статусом 404.'
+            )
+
+    def test_04_cursor_with_ordering_or_search(self, client):
+        for params in ('ordering=-year', 'search=title', 'ordering=name'):
+            response = client.get(f'{self.TITLES_URL}?cursor=&{params}')
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                'Проверьте, что параметр `cursor` нельзя совмещать с '
+                '`ordering` и `search`: запрос возвращает ответ со '
+                'статусом 400.'
+            )
+        response = client.get(f'{self.TITLES_URL}?ordering=-year')
+        assert response.status_code == HTTPStatus.OK
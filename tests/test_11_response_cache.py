@@ -0,0 +1,94 @@
+import pytest
+
+from tests.utils import create_reviews, create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11ResponseCache:
+
+    CATEGORY_URL = '/api/v1/categories/'
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def test_01_cache_hit_skips_database(self, client, admin_client,
+                                         django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        detail_url = self.TITLES_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        for url in (self.TITLES_URL, detail_url, self.CATEGORY_URL):
+            expected = client.get(url).json()
+            with django_assert_num_queries(0):
+                response = client.get(url)
+            assert response.json() == expected, (
+                f'Проверьте, что повторный GET-запрос к `{url}` '
+                'возвращает закешированный ответ без запросов к базе.'
+            )
+
+    def test_02_query_params_are_normalized(self, client, admin_client,
+                                            django_assert_num_queries):
+        create_titles(admin_client)
+        client.get(self.TITLES_URL, {'year': 1984, 'name': 'Терм'})
+        with django_assert_num_queries(0):
+            client.get(f'{self.TITLES_URL}?name=Терм&year=1984')
+
+    def test_03_writes_invalidate_cache(self, client, admin_client, admin,
+                                        user_client, user):
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        detail_url = self.TITLES_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        assert client.get(detail_url).json()['rating'] == 5
+
+        create_single_review(user_client, titles[0]['id'], 'Так себе', 1)
+        assert client.get(detail_url).json()['rating'] == 3, (
+            'Проверьте, что новый отзыв сбрасывает кеш произведения.'
+        )
+
+        admin_client.patch(detail_url, data={'genre': ['drama']})
+        genres = client.get(detail_url).json()['genre']
+        assert [genre['slug'] for genre in genres] == ['drama'], (
+            'Проверьте, что изменение жанров сбрасывает кеш произведения.'
+        )
+
+        client.get(self.CATEGORY_URL)
+        admin_client.delete(f'{self.CATEGORY_URL}books/')
+        data = client.get(self.CATEGORY_URL).json()
+        assert data['count'] == 1, (
+            'Проверьте, что удаление категории сбрасывает кеш категорий.'
+        )
+        assert len(client.get(self.TITLES_URL).json()['results']) == 1, (
+            'Проверьте, что удаление категории сбрасывает кеш произведений.'
+        )
+
+    def test_04_versions_bumped_on_commit(self, client, admin_client):
+        from django.db import transaction
+
+        from reviews.models import Category
+
+        expected = client.get(self.CATEGORY_URL).json()
+        with transaction.atomic():
+            Category.objects.create(name='Музыка', slug='music')
+            assert client.get(self.CATEGORY_URL).json() == expected, (
+                'Проверьте, что версия данных меняется только после '
+                'фиксации транзакции.'
+            )
+        assert client.get(self.CATEGORY_URL).json() != expected, (
+            'Проверьте, что после фиксации транзакции кеш ответа '
+            'становится устаревшим.'
+        )
+
+    def test_05_versions_expire(self, client, admin_client, settings):
+        import time
+
+        settings.API_RESPONSE_CACHE = {
+            **settings.API_RESPONSE_CACHE, 'VERSION_TIMEOUT': 0.2
+        }
+        etag = client.get(self.CATEGORY_URL)['ETag']
+        assert client.get(self.CATEGORY_URL)['ETag'] == etag
+        time.sleep(0.3)
+        assert client.get(self.CATEGORY_URL)['ETag'] != etag, (
+            'Проверьте, что версии моделей хранятся в кеше ограниченное '
+            'время: иначе процессы с локальным кешем никогда не увидят '
+            'чужих изменений.'
+        )
@@ -0,0 +1,76 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_comments, create_single_review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12ConditionalGet:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def test_01_etag(self, client, admin_client, admin, user_client, user):
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        urls = (
+            self.TITLES_URL,
+            self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id']),
+            self.COMMENTS_URL_TEMPLATE.format(
+                title_id=titles[0]['id'], review_id=reviews[0]['id']
+            ),
+        )
+        for url in urls:
+            response = client.get(url)
+            etag = response['ETag']
+            assert etag and response.has_header('Last-Modified'), (
+                f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+                'заголовки `ETag` и `Last-Modified`.'
+            )
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+                f'Проверьте, что GET-запрос к `{url}` с актуальным '
+                '`If-None-Match` возвращает ответ со статусом 304.'
+            )
+            assert not response.content
+
+        reviews_url = urls[1]
+        etag = client.get(reviews_url)['ETag']
+        create_single_review(user_client, titles[0]['id'], 'Ещё отзыв', 2)
+        response = client.get(reviews_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после добавления отзыва `ETag` списка отзывов '
+            'меняется.'
+        )
+        etag = response['ETag']
+        admin_client.patch(
+            f'{reviews_url}{reviews[0]["id"]}/', data={'text': 'Новый текст'}
+        )
+        response = client.get(reviews_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после изменения отзыва `ETag` списка отзывов '
+            'меняется.'
+        )
+
+    def test_02_last_modified(self, client, admin_client, admin):
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        last_modified = client.get(url)['Last-Modified']
+        response = client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с актуальным '
+            '`If-Modified-Since` возвращает ответ со статусом 304.'
+        )
+        response = client.get(
+            url, HTTP_IF_MODIFIED_SINCE='Thu, 01 Jan 1970 00:00:00 GMT'
+        )
+        assert response.status_code == HTTPStatus.OK
@@ -0,0 +1,84 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13TitleSearch:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def search(self, client, text):
+        response = client.get(self.TITLES_URL, {'search': text})
+        return [title['id'] for title in response.json()['results']]
+
+    def test_01_search(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        response = admin_client.post(self.TITLES_URL, data={
+            'name': 'Терминатор 2',
+            'year': 1991,
+            'genre': [genres[0]['slug']],
+            'category': categories[0]['slug'],
+            'description': 'Терминатор против терминатора',
+        })
+        sequel_id = response.json()['id']
+
+        assert self.search(client, 'терминатор') == [
+            sequel_id, titles[0]['id']
+        ], (
+            'Проверьте, что параметр `search` ищет по названию и описанию '
+            'и сортирует произведения по релевантности.'
+        )
+        assert self.search(client, 'yippie') == [titles[1]['id']], (
+            'Проверьте, что параметр `search` ищет по описанию произведения.'
+        )
+        assert self.search(client, 'терм') == self.search(
+            client, 'терминатор'
+        ), 'Проверьте, что параметр `search` ищет по началу слова.'
+        assert self.search(client, '"(*') == []
+
+        admin_client.patch(
+            self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=titles[1]['id']),
+            data={'name': 'Крепкий терминатор'}
+        )
+        assert titles[1]['id'] in self.search(client, 'терминатор'), (
+            'Проверьте, что индекс поиска обновляется при изменении '
+            'произведения.'
+        )
+        admin_client.delete(
+            self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=sequel_id)
+        )
+        assert sequel_id not in self.search(client, 'терминатор'), (
+            'Проверьте, что индекс поиска обновляется при удалении '
+            'произведения.'
+        )
+
+        response = client.get(self.TITLES_URL, {'name': 'минат'})
+        assert response.json()['count'] == 2, (
+            'Проверьте, что фильтр `name` по-прежнему ищет по вхождению '
+            'подстроки.'
+        )
+
+    def test_02_search_joins_index_once(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(
+                self.TITLES_URL, {'search': 'терминатор', 'year': 1984}
+            )
+        assert [title['id'] for title in response.json()['results']] == [
+            titles[0]['id']
+        ]
+        search_queries = [
+            query['sql'] for query in context.captured_queries
+            if 'MATCH' in query['sql']
+        ]
+        assert search_queries and all(
+            sql.count('MATCH') == 1 for sql in search_queries
+        ), (
+            'Проверьте, что индекс поиска присоединяется к запросу один '
+            'раз, а релевантность не вычисляется подзапросом для каждой '
+            'строки.'
+        )
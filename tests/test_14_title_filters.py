@@ -0,0 +1,106 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14TitleFilters:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def filter_ids(self, client, **params):
+        response = client.get(self.TITLES_URL, params)
+        assert response.status_code == HTTPStatus.OK
+        return sorted(title['id'] for title in response.json()['results'])
+
+    def test_01_genre_and_category_filters(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        horror, comedy, drama = (genre['slug'] for genre in genres)
+        first, second = titles[0]['id'], titles[1]['id']
+
+        assert self.filter_ids(client, genre=horror) == [first]
+        assert self.filter_ids(client, genre='horr') == [], (
+            'Проверьте, что фильтр `genre` сравнивает slug жанра '
+            'целиком.'
+        )
+        assert self.filter_ids(client, genre=f'{horror},{comedy}') == [
+            first
+        ], (
+            'Проверьте, что фильтр `genre` по нескольким жанрам не '
+            'возвращает дубликаты произведений.'
+        )
+        assert self.filter_ids(client, genre=f'{horror},{drama}') == [
+            first, second
+        ]
+        assert self.filter_ids(
+            client, genre=f'{horror},{comedy}', genre_mode='all'
+        ) == [first], (
+            'Проверьте, что при `genre_mode=all` возвращаются произведения '
+            'со всеми перечисленными жанрами.'
+        )
+        assert self.filter_ids(
+            client, genre=f'{horror},{drama}', genre_mode='all'
+        ) == []
+        assert self.filter_ids(
+            client, genre=f'{horror},unknown', genre_mode='all'
+        ) == []
+        response = client.get(self.TITLES_URL, {'genre_mode': 'some'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+        assert self.filter_ids(
+            client, category=categories[1]['slug']
+        ) == [second]
+        assert self.filter_ids(
+            client,
+            category=f'{categories[0]["slug"]},{categories[1]["slug"]}'
+        ) == [first, second]
+
+    def test_02_ordering(self, client, admin_client):
+        create_titles(admin_client)
+
+        for ordering in ('name', '-name', 'year', '-year', '-rating', 'id'):
+            response = client.get(self.TITLES_URL, {'ordering': ordering})
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что `{self.TITLES_URL}?ordering={ordering}` '
+                'возвращает ответ со статусом 200.'
+            )
+            field = ordering.lstrip('-')
+            values = [title[field] for title in response.json()['results']]
+            if field != 'rating':
+                assert values == sorted(
+                    values, reverse=ordering.startswith('-')
+                ), (
+                    f'Проверьте, что `?ordering={ordering}` сортирует '
+                    'произведения.'
+                )
+        response = client.get(self.TITLES_URL, {'ordering': 'description'})
+        assert response.status_code == HTTPStatus.OK
+
+    def test_03_ordering_by_fractional_rating(self, client, admin_client):
+        from reviews.models import Title
+
+        titles, _, _ = create_titles(admin_client)
+        lower, higher = titles[0]['id'], titles[1]['id']
+        Title.objects.filter(pk=lower).update(rating_sum=16, rating_count=2)
+        Title.objects.filter(pk=higher).update(rating_sum=17, rating_count=2)
+        for ordering, expected in (
+            ('rating', [lower, higher]), ('-rating', [higher, lower])
+        ):
+            ids = [
+                title['id'] for title in client.get(
+                    self.TITLES_URL, {'ordering': ordering}
+                ).json()['results']
+                if title['id'] in (lower, higher)
+            ]
+            assert ids == expected, (
+                f'Проверьте, что `?ordering={ordering}` учитывает дробную '
+                'часть средней оценки.'
+            )
+        response = client.get(
+            self.TITLES_URL, {'ordering': '-rating'}
+        ).json()['results']
+        assert response[0]['rating'] == 8, (
+            'Проверьте, что рейтинг в ответе по-прежнему целое число.'
+        )
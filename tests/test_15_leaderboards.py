@@ -0,0 +1,90 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15Leaderboards:
+
+    TOP_URL = '/api/v1/titles/top/'
+    TRENDING_URL = '/api/v1/titles/trending/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def ids(self, client, url, **params):
+        response = client.get(url, params)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает ответ со '
+            'статусом 200.'
+        )
+        return [title['id'] for title in response.json()]
+
+    def test_01_top_and_trending(self, client, admin_client, admin,
+                                 user_client, user):
+        titles, categories, genres = create_titles(admin_client)
+        first, second = titles[0]['id'], titles[1]['id']
+        create_single_review(admin_client, first, 'Неплохо', 6)
+        create_single_review(admin_client, second, 'Отлично', 9)
+        create_single_review(user_client, second, 'Хорошо', 8)
+
+        assert self.ids(client, self.TOP_URL) == [second, first], (
+            f'Проверьте, что `{self.TOP_URL}` сортирует произведения по '
+            'средней оценке.'
+        )
+        assert self.ids(client, self.TOP_URL, min_reviews=2) == [second], (
+            f'Проверьте, что `{self.TOP_URL}` учитывает параметр '
+            '`min_reviews`.'
+        )
+        assert self.ids(
+            client, self.TOP_URL, category=categories[0]['slug']
+        ) == [first]
+        assert self.ids(
+            client, self.TOP_URL, genre=genres[2]['slug']
+        ) == [second]
+        assert self.ids(client, self.TOP_URL, limit=1) == [second]
+        response = client.get(self.TOP_URL, {'limit': 0})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+        assert self.ids(client, self.TRENDING_URL) == [second, first], (
+            f'Проверьте, что `{self.TRENDING_URL}` сортирует произведения '
+            'по количеству недавних отзывов.'
+        )
+
+        review_id = user_client.get(
+            self.REVIEWS_URL_TEMPLATE.format(title_id=second)
+        ).json()['results'][0]['id']
+        user_client.patch(
+            f'{self.REVIEWS_URL_TEMPLATE.format(title_id=second)}'
+            f'{review_id}/',
+            data={'score': 1}
+        )
+        assert self.ids(client, self.TOP_URL) == [first, second], (
+            'Проверьте, что рейтинг обновляется при изменении оценки.'
+        )
+        user_client.delete(
+            f'{self.REVIEWS_URL_TEMPLATE.format(title_id=second)}'
+            f'{review_id}/'
+        )
+        assert self.ids(client, self.TOP_URL) == [second, first]
+        assert self.ids(client, self.TRENDING_URL) == [first, second]
+
+        admin_client.delete(f'/api/v1/titles/{first}/')
+        assert self.ids(client, self.TOP_URL) == [second]
+
+    def test_02_rebuild_rankings(self, client, admin_client, admin):
+        from reviews.models import DailyReviewCount, TitleRanking
+
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(admin_client, titles[0]['id'], 'Хорошо', 8)
+        TitleRanking.objects.all().delete()
+        DailyReviewCount.objects.all().delete()
+
+        call_command('rebuild_rankings')
+
+        assert self.ids(client, self.TOP_URL) == [titles[0]['id']], (
+            'Проверьте, что команда `rebuild_rankings` восстанавливает '
+            'таблицу рейтинга.'
+        )
+        assert self.ids(client, self.TRENDING_URL) == [titles[0]['id']]
@@ -0,0 +1,64 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_reviews
+
+TITLE_LOOKUP = '"reviews_title"."description"'
+REVIEW_LOOKUP = '"reviews_review"."text"'
+
+
+def count_lookups(queries, marker):
+    return sum(
+        marker in query['sql'] for query in queries
+        if query['sql'].startswith('SELECT')
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16ParentLookups:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def test_01_review_parent_lookup(self, admin_client, admin, client,
+                                     user_client):
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+
+        with CaptureQueriesContext(connection) as context:
+            user_client.post(url, data={'text': 'Отзыв', 'score': 5})
+        assert count_lookups(context.captured_queries, TITLE_LOOKUP) == 1, (
+            f'Проверьте, что POST-запрос к `{self.REVIEWS_URL_TEMPLATE}` '
+            'загружает произведение из базы один раз.'
+        )
+        with CaptureQueriesContext(connection) as context:
+            client.get(url)
+        assert count_lookups(context.captured_queries, TITLE_LOOKUP) == 1
+
+    def test_02_comment_parent_lookup(self, admin_client, admin, client,
+                                      user_client):
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+
+        for request in (
+            lambda: user_client.post(url, data={'text': 'Комментарий'}),
+            lambda: client.get(url),
+        ):
+            with CaptureQueriesContext(connection) as context:
+                request()
+            queries = context.captured_queries
+            assert count_lookups(queries, REVIEW_LOOKUP) == 1, (
+                f'Проверьте, что запрос к `{self.COMMENTS_URL_TEMPLATE}` '
+                'загружает отзыв из базы один раз.'
+            )
+            assert count_lookups(queries, TITLE_LOOKUP) == count_lookups(
+                queries, REVIEW_LOOKUP
+            ), (
+                'Проверьте, что отзыв и произведение загружаются одним '
+                'запросом.'
+            )
@@ -0,0 +1,65 @@
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from threading import Barrier
+
+import pytest
+from django.db import connection
+
+from tests.utils import create_titles
+
+PARALLEL_REQUESTS = 4
+
+
+def post_in_parallel(client, url, data):
+    barrier = Barrier(PARALLEL_REQUESTS)
+
+    def post(_):
+        barrier.wait()
+        try:
+            return client.post(url, data=data).status_code
+        finally:
+            connection.close()
+
+    with ThreadPoolExecutor(PARALLEL_REQUESTS) as executor:
+        return sorted(executor.map(post, range(PARALLEL_REQUESTS)))
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17ConcurrentWrites:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    URL_SIGNUP = '/api/v1/auth/signup/'
+
+    def test_01_parallel_duplicate_reviews(self, admin_client, user_client):
+        from reviews.models import Review
+
+        titles, _, _ = create_titles(admin_client)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+
+        statuses = post_in_parallel(
+            user_client, url, {'text': 'Отзыв', 'score': 5}
+        )
+        assert statuses == [HTTPStatus.CREATED] + [
+            HTTPStatus.BAD_REQUEST
+        ] * (PARALLEL_REQUESTS - 1), (
+            'Проверьте, что из параллельных POST-запросов одного '
+            f'пользователя к `{self.REVIEWS_URL_TEMPLATE}` успешен только '
+            'один, а остальные получают ответ со статусом 400.'
+        )
+        assert Review.objects.count() == 1
+
+    def test_02_parallel_signup(self, client, django_user_model):
+        data = {'username': 'racer', 'email': 'racer@yamdb.fake'}
+
+        statuses = post_in_parallel(client, self.URL_SIGNUP, data)
+        assert statuses == [HTTPStatus.OK] * PARALLEL_REQUESTS, (
+            f'Проверьте, что параллельные POST-запросы к `{self.URL_SIGNUP}` '
+            'с одинаковыми данными возвращают ответ со статусом 200.'
+        )
+        assert django_user_model.objects.count() == 1
+
+        statuses = post_in_parallel(
+            client, self.URL_SIGNUP,
+            {'username': 'racer', 'email': 'other@yamdb.fake'}
+        )
+        assert statuses == [HTTPStatus.BAD_REQUEST] * PARALLEL_REQUESTS
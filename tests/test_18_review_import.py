@@ -0,0 +1,143 @@
+import json
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18ReviewImport:
+
+    IMPORT_URL = '/api/v1/reviews/import/'
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    SCORES_URL_TEMPLATE = '/api/v1/titles/{title_id}/scores/'
+
+    def post_lines(self, client, lines):
+        body = '\n'.join(
+            line if isinstance(line, str) else json.dumps(line)
+            for line in lines
+        )
+        return client.post(
+            self.IMPORT_URL, data=body.encode(),
+            content_type='application/x-ndjson'
+        )
+
+    def test_01_import_permissions(self, client, user_client):
+        for api_client in (client, user_client):
+            response = self.post_lines(api_client, [])
+            assert response.status_code in (
+                HTTPStatus.UNAUTHORIZED, HTTPStatus.FORBIDDEN
+            ), (
+                f'Проверьте, что `{self.IMPORT_URL}` доступен только '
+                'администратору.'
+            )
+
+    def test_02_import_reviews(self, client, admin_client, admin, user,
+                               moderator):
+        titles, _, _ = create_titles(admin_client)
+        first, second = titles[0]['id'], titles[1]['id']
+        lines = [
+            {'title': first, 'author': admin.username, 'text': 'А',
+             'score': 10},
+            {'title': first, 'author': user.username, 'text': 'Б',
+             'score': 6},
+            {'title': second, 'author': moderator.username, 'text': 'В',
+             'score': 3},
+            {'title': first, 'author': admin.username, 'text': 'Дубль',
+             'score': 1},
+            {'title': 999, 'author': user.username, 'text': 'Г',
+             'score': 5},
+            {'title': second, 'author': 'nobody', 'text': 'Д', 'score': 5},
+            {'title': second, 'author': user.username, 'text': 'Е',
+             'score': 11},
+            '{broken',
+        ]
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.post_lines(admin_client, lines)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что POST-запрос администратора к `{self.IMPORT_URL}` '
+            'возвращает ответ со статусом 200.'
+        )
+        data = response.json()
+        assert data['created'] == 3, (
+            f'Проверьте, что `{self.IMPORT_URL}` сохраняет корректные строки.'
+        )
+        errors = {error['line']: error['errors'] for error in data['errors']}
+        assert sorted(errors) == [4, 5, 6, 7, 8], (
+            f'Проверьте, что `{self.IMPORT_URL}` возвращает ошибки для '
+            'каждой некорректной строки с её номером.'
+        )
+        title_updates = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('UPDATE "reviews_title" ')
+        ]
+        assert len(title_updates) == 2, (
+            'Проверьте, что рейтинг обновляется один раз на произведение, '
+            'а не на каждый загруженный отзыв.'
+        )
+        review_inserts = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('INSERT INTO "reviews_review"')
+        ]
+        assert len(review_inserts) == 1
+        assert 'non_field_errors' in errors[4]
+        assert 'title' in errors[5]
+        assert 'author' in errors[6]
+        assert 'score' in errors[7]
+
+        rating = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=first)
+        ).json()['rating']
+        assert rating == 8, (
+            'Проверьте, что загруженные отзывы учитываются в рейтинге '
+            'произведения.'
+        )
+        scores = client.get(
+            self.SCORES_URL_TEMPLATE.format(title_id=second)
+        ).json()
+        assert {item['score']: item['count'] for item in scores}[3] == 1
+
+        response = self.post_lines(admin_client, lines[:1])
+        assert response.json()['created'] == 0
+
+    def test_03_import_conflicts(self, client, admin_client, admin, user,
+                                 monkeypatch):
+        from api.views import ReviewImportView
+
+        titles, _, _ = create_titles(admin_client)
+        first = titles[0]['id']
+        self.post_lines(admin_client, [
+            {'title': first, 'author': admin.username, 'text': 'А',
+             'score': 10},
+        ])
+        # Отзыв, сохранённый параллельным запросом после проверки пачки.
+        monkeypatch.setattr(
+            ReviewImportView, 'get_existing',
+            staticmethod(lambda title_ids, author_ids: set())
+        )
+        response = self.post_lines(admin_client, [
+            {'title': first, 'author': user.username, 'text': 'Б',
+             'score': 6},
+            {'title': first, 'author': admin.username, 'text': 'Дубль',
+             'score': 1},
+            '{broken',
+        ])
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что конфликт при сохранении пачки в '
+            f'`{self.IMPORT_URL}` не приводит к ошибке сервера.'
+        )
+        data = response.json()
+        assert data['created'] == 1, (
+            'Проверьте, что при конфликте строки пачки сохраняются по одной.'
+        )
+        assert [error['line'] for error in data['errors']] == [2, 3], (
+            'Проверьте, что ошибки отсортированы по номеру строки.'
+        )
+        rating = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=first)
+        ).json()['rating']
+        assert rating == 8
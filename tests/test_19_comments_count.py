@@ -0,0 +1,65 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19CommentsCount:
+
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+    COMMENT_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/{comment_id}/'
+    )
+
+    def get_comments_count(self, client, title_id, review_id):
+        response = client.get(self.REVIEW_DETAIL_URL_TEMPLATE.format(
+            title_id=title_id, review_id=review_id
+        ))
+        assert response.status_code == HTTPStatus.OK
+        return response.json().get('comments_count')
+
+    def test_01_count_follows_comment_writes(self, client, admin_client,
+                                             admin, user_client, user):
+        author_map = {admin: admin_client, user: user_client}
+        comments, reviews, titles = create_comments(admin_client, author_map)
+        title_id, review_id = titles[0]['id'], reviews[0]['id']
+        assert self.get_comments_count(client, title_id, review_id) == 2, (
+            'Проверьте, что ответ на GET-запрос к отзыву содержит поле '
+            '`comments_count` с количеством комментариев.'
+        )
+        assert self.get_comments_count(
+            client, title_id, reviews[1]['id']
+        ) == 0
+
+        response = user_client.delete(self.COMMENT_DETAIL_URL_TEMPLATE.format(
+            title_id=title_id, review_id=review_id,
+            comment_id=comments[1]['id']
+        ))
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_comments_count(client, title_id, review_id) == 1, (
+            'Проверьте, что `comments_count` уменьшается при удалении '
+            'комментария.'
+        )
+
+    def test_02_recalculate_command(self, client, admin_client, admin,
+                                    user_client, user):
+        from reviews.models import Review
+
+        author_map = {admin: admin_client, user: user_client}
+        _, reviews, titles = create_comments(admin_client, author_map)
+        Review.objects.update(comments_count=7)
+        call_command('recalculate_comments_count')
+        assert self.get_comments_count(
+            client, titles[0]['id'], reviews[0]['id']
+        ) == 2, (
+            'Проверьте, что команда `recalculate_comments_count` '
+            'восстанавливает количество комментариев.'
+        )
+        assert self.get_comments_count(
+            client, titles[0]['id'], reviews[1]['id']
+        ) == 0
@@ -0,0 +1,73 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_reviews, create_single_comment
+
+COMMENT_SELECT = 'FROM "reviews_comment"'
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20EmbeddedComments:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def test_01_latest_comments_embedded(self, admin_client, admin, client,
+                                         user_client, user):
+        author_map = {admin: admin_client, user: user_client}
+        reviews, titles = create_reviews(admin_client, author_map)
+        title_id = titles[0]['id']
+        for idx in range(4):
+            create_single_comment(
+                user_client, title_id, reviews[0]['id'], f'Комментарий {idx}'
+            )
+        create_single_comment(
+            admin_client, title_id, reviews[1]['id'], 'Единственный'
+        )
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title_id)
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, {'embed_comments': 3})
+        assert response.status_code == HTTPStatus.OK
+        comment_queries = [
+            query for query in context.captured_queries
+            if COMMENT_SELECT in query['sql']
+            and query['sql'].startswith('SELECT')
+        ]
+        assert len(comment_queries) == 1, (
+            f'Проверьте, что `{self.REVIEWS_URL_TEMPLATE}?embed_comments=N` '
+            'загружает комментарии всей страницы одним запросом.'
+        )
+        embedded = {
+            review['id']: review['comments']
+            for review in response.json()['results']
+        }
+        assert [comment['text'] for comment in embedded[reviews[0]['id']]] == [
+            'Комментарий 3', 'Комментарий 2', 'Комментарий 1'
+        ], (
+            'Проверьте, что в отзыв вкладываются N последних комментариев '
+            'от новых к старым.'
+        )
+        assert embedded[reviews[1]['id']][0] == {
+            'id': embedded[reviews[1]['id']][0]['id'],
+            'author': admin.username,
+            'text': 'Единственный',
+            'pub_date': embedded[reviews[1]['id']][0]['pub_date'],
+        }
+
+    def test_02_embed_comments_validation(self, admin_client, admin, client):
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+
+        response = client.get(url)
+        assert 'comments' not in response.json()['results'][0], (
+            'Проверьте, что без `embed_comments` комментарии не вкладываются.'
+        )
+        for value in ('abc', -1, 100):
+            response = client.get(url, {'embed_comments': value})
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                'Проверьте, что некорректное значение `embed_comments` '
+                'возвращает ответ со статусом 400.'
+            )
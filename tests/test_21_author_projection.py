@@ -0,0 +1,55 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_comments
+
+USER_TABLE = '"users_user"'
+PASSWORD_COLUMN = '"users_user"."password"'
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21AuthorProjection:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def test_01_author_joined_in_list_query(self, admin_client, admin,
+                                            user_client, user,
+                                            moderator_client, moderator,
+                                            client):
+        author_map = {
+            admin: admin_client, user: user_client,
+            moderator: moderator_client
+        }
+        _, reviews, titles = create_comments(admin_client, author_map)
+        title_id = titles[0]['id']
+        for url in (
+            self.REVIEWS_URL_TEMPLATE.format(title_id=title_id),
+            self.REVIEWS_URL_TEMPLATE.format(title_id=title_id)
+            + '?embed_comments=3',
+            self.COMMENTS_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[0]['id']
+            ),
+        ):
+            with CaptureQueriesContext(connection) as context:
+                response = client.get(url)
+            authors = {row['author'] for row in response.json()['results']}
+            assert authors == {
+                admin.username, user.username, moderator.username
+            }
+            user_queries = [
+                query['sql'] for query in context.captured_queries
+                if USER_TABLE in query['sql']
+            ]
+            assert all(' JOIN ' in sql for sql in user_queries), (
+                f'Проверьте, что GET-запрос к `{url}` получает авторов '
+                'соединением в основном запросе, а не отдельным запросом '
+                'на каждую строку.'
+            )
+            assert not any(PASSWORD_COLUMN in sql for sql in user_queries), (
+                f'Проверьте, что GET-запрос к `{url}` загружает из таблицы '
+                'пользователей только username.'
+            )
@@ -0,0 +1,58 @@
+import pytest
+from django.db import connection
+
+from tests.utils import create_comments
+
+TEMP_SORT = 'USE TEMP B-TREE FOR ORDER BY'
+
+
+def make_view(viewset_class, **kwargs):
+    view = viewset_class(kwargs=kwargs, action='list', format_kwarg=None)
+    view.request = None
+    return view
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.skipif(
+    connection.vendor != 'sqlite', reason='План запроса SQLite.'
+)
+class Test22QueryPlans:
+
+    def get_querysets(self, title_id, review_id, author_id):
+        from api.views import CommentViewSet, ReviewViewSet, TitleViewSet
+        from reviews.models import Comment, Review
+
+        querysets = {
+            'titles': TitleViewSet.queryset,
+            'reviews': make_view(
+                ReviewViewSet, title_id=title_id
+            ).get_queryset(),
+            'comments': make_view(
+                CommentViewSet, title_id=title_id, review_id=review_id
+            ).get_queryset(),
+            'author reviews': Review.objects.filter(author_id=author_id),
+            'author comments': Comment.objects.filter(author_id=author_id),
+        }
+        keyset = {
+            'titles': TitleViewSet.cursor_ordering,
+            'reviews': ReviewViewSet.cursor_ordering,
+            'comments': CommentViewSet.cursor_ordering,
+            'author reviews': ('-pub_date', '-id'),
+            'author comments': ('-pub_date', '-id'),
+        }
+        for name, queryset in querysets.items():
+            yield name, queryset
+            yield f'{name} (cursor)', queryset.order_by(*keyset[name])
+
+    def test_01_no_temp_btree_for_order_by(self, admin_client, admin,
+                                           user_client, user):
+        author_map = {admin: admin_client, user: user_client}
+        _, reviews, titles = create_comments(admin_client, author_map)
+        for name, queryset in self.get_querysets(
+            titles[0]['id'], reviews[0]['id'], user.id
+        ):
+            plan = queryset.explain()
+            assert TEMP_SORT not in plan, (
+                f'Проверьте, что для выборки `{name}` есть индекс, '
+                f'совпадающий с сортировкой. План запроса:\n{plan}'
+            )
@@ -0,0 +1,92 @@
+import json
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_comments
+
+
+def read_lines(response):
+    assert response.status_code == HTTPStatus.OK
+    assert response.streaming, (
+        'Проверьте, что выгрузка отдаётся потоком (StreamingHttpResponse).'
+    )
+    assert response['Content-Type'] == 'application/x-ndjson'
+    content = b''.join(response.streaming_content).decode()
+    return [json.loads(line) for line in content.splitlines()]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23Export:
+
+    REVIEWS_EXPORT_URL = '/api/v1/reviews/export/'
+    COMMENTS_EXPORT_URL = '/api/v1/comments/export/'
+
+    def test_01_export_permissions(self, client, user_client,
+                                   moderator_client):
+        for url in (self.REVIEWS_EXPORT_URL, self.COMMENTS_EXPORT_URL):
+            for api_client in (client, user_client, moderator_client):
+                response = api_client.get(url)
+                assert response.status_code in (
+                    HTTPStatus.UNAUTHORIZED, HTTPStatus.FORBIDDEN
+                ), f'Проверьте, что `{url}` доступен только администратору.'
+
+    def test_02_export_reviews(self, admin_client, admin, user_client,
+                               user):
+        author_map = {admin: admin_client, user: user_client}
+        _, reviews, titles = create_comments(admin_client, author_map)
+
+        rows = read_lines(admin_client.get(self.REVIEWS_EXPORT_URL))
+        assert len(rows) == len(reviews), (
+            f'Проверьте, что `{self.REVIEWS_EXPORT_URL}` выгружает все '
+            'отзывы, по одному JSON-объекту на строку.'
+        )
+        assert set(rows[0]) == {
+            'id', 'title', 'author', 'score', 'text', 'pub_date'
+        }
+        assert rows[0]['title'] == titles[0]['id']
+        assert rows[0]['author'] == admin.username
+
+        rows = read_lines(admin_client.get(
+            self.REVIEWS_EXPORT_URL, {'author': user.username}
+        ))
+        assert {row['author'] for row in rows} == {user.username}, (
+            f'Проверьте, что `{self.REVIEWS_EXPORT_URL}` фильтрует отзывы '
+            'по автору.'
+        )
+        until = rows[0]['pub_date']
+        rows = read_lines(admin_client.get(
+            self.REVIEWS_EXPORT_URL, {'title': titles[0]['id'],
+                                      'until': until}
+        ))
+        assert [row['author'] for row in rows] == [admin.username], (
+            f'Проверьте, что `{self.REVIEWS_EXPORT_URL}` фильтрует отзывы '
+            'по произведению и дате публикации.'
+        )
+
+    def test_03_export_comments(self, admin_client, admin, user_client,
+                                user):
+        author_map = {admin: admin_client, user: user_client}
+        comments, reviews, titles = create_comments(admin_client, author_map)
+
+        rows = read_lines(admin_client.get(
+            self.COMMENTS_EXPORT_URL, {'title': titles[0]['id']}
+        ))
+        assert [row['id'] for row in rows] == [
+            comment['id'] for comment in comments
+        ], (
+            f'Проверьте, что `{self.COMMENTS_EXPORT_URL}` выгружает '
+            'комментарии к отзывам произведения.'
+        )
+        assert rows[0]['review'] == reviews[0]['id']
+        assert not read_lines(admin_client.get(
+            self.COMMENTS_EXPORT_URL, {'title': titles[1]['id']}
+        ))
+
+        response = admin_client.get(
+            self.COMMENTS_EXPORT_URL, {'since': 'вчера'}
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            f'Проверьте, что `{self.COMMENTS_EXPORT_URL}` возвращает 400 '
+            'для некорректных фильтров.'
+        )
@@ -0,0 +1,88 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import (create_comments, create_single_comment,
+                         create_single_review)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24AuthorFeeds:
+
+    MY_FEED_URL_TEMPLATE = '/api/v1/users/me/{feed}/'
+    USER_FEED_URL_TEMPLATE = '/api/v1/users/{username}/{feed}/'
+
+    def walk(self, api_client, url):
+        items = []
+        while url:
+            response = api_client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            data = response.json()
+            assert 'count' not in data, (
+                'Проверьте, что ленты автора используют keyset-пагинацию.'
+            )
+            items.extend(data['results'])
+            url = data['next']
+        return items
+
+    def test_01_my_feeds(self, client, admin_client, admin, user_client,
+                         user):
+        author_map = {admin: admin_client, user: user_client}
+        comments, reviews, titles = create_comments(admin_client, author_map)
+        for title in titles[1:]:
+            create_single_review(
+                user_client, title['id'], 'Ещё отзыв', 7
+            )
+        for idx in range(6):
+            response = create_single_comment(
+                user_client, titles[0]['id'], reviews[0]['id'],
+                f'Комментарий {idx}'
+            )
+            comments.append(
+                {'id': response.json()['id'], 'author': user.username}
+            )
+
+        url = self.MY_FEED_URL_TEMPLATE.format(feed='reviews')
+        assert client.get(url).status_code == HTTPStatus.UNAUTHORIZED
+        my_reviews = self.walk(user_client, url)
+        assert len(my_reviews) == len(titles), (
+            f'Проверьте, что `{self.MY_FEED_URL_TEMPLATE}` возвращает '
+            'все отзывы текущего пользователя.'
+        )
+        assert {review['author'] for review in my_reviews} == {user.username}
+        assert {review['title'] for review in my_reviews} == {
+            title['id'] for title in titles
+        }
+
+        url = self.MY_FEED_URL_TEMPLATE.format(feed='comments')
+        my_comments = self.walk(user_client, url)
+        assert [comment['id'] for comment in my_comments] == [
+            comment['id'] for comment in reversed(comments)
+            if comment['author'] == user.username
+        ], (
+            f'Проверьте, что `{self.MY_FEED_URL_TEMPLATE}` отдаёт все '
+            'комментарии пользователя по страницам, от новых к старым.'
+        )
+        assert my_comments[0]['review'] == reviews[0]['id']
+
+    def test_02_user_feeds(self, client, admin_client, admin, user_client,
+                           user):
+        comments, reviews, _ = create_comments(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        for feed, expected in (('reviews', reviews), ('comments', comments)):
+            url = self.USER_FEED_URL_TEMPLATE.format(
+                username=admin.username, feed=feed
+            )
+            items = self.walk(client, url)
+            assert {item['id'] for item in items} == {
+                item['id'] for item in expected
+                if item['author'] == admin.username
+            }, (
+                f'Проверьте, что `{self.USER_FEED_URL_TEMPLATE}` возвращает '
+                'публикации указанного пользователя.'
+            )
+        response = client.get(self.USER_FEED_URL_TEMPLATE.format(
+            username='nobody', feed='reviews'
+        ))
+        assert response.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,133 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_reviews
+
+
+@pytest.fixture
+def low_rates(monkeypatch):
+    from api.throttling import ScopedTokenBucketThrottle
+
+    rates = {'reviews': '2/min', 'comments': '2/min', 'signup': '2/min'}
+    monkeypatch.setattr(ScopedTokenBucketThrottle, 'THROTTLE_RATES', rates)
+    return rates
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25Throttling:
+
+    SIGNUP_URL = '/api/v1/auth/signup/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def signup(self, client, idx):
+        return client.post(self.SIGNUP_URL, data={
+            'username': f'bot{idx}', 'email': f'bot{idx}@yamdb.fake'
+        })
+
+    def test_01_signup_throttled(self, client, low_rates):
+        for idx in range(2):
+            assert self.signup(client, idx).status_code == HTTPStatus.OK
+        response = self.signup(client, 2)
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            f'Проверьте, что частые POST-запросы к `{self.SIGNUP_URL}` '
+            'получают ответ со статусом 429.'
+        )
+        assert int(response['Retry-After']) == 30, (
+            'Проверьте, что ответ 429 содержит заголовок Retry-After со '
+            'временем до появления токена.'
+        )
+
+    def test_02_comment_buckets(self, admin_client, admin, user_client,
+                                client, low_rates):
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        statuses = [
+            user_client.post(url, data={'text': 'Спам'}).status_code
+            for _ in range(3)
+        ]
+        assert statuses == [
+            HTTPStatus.CREATED, HTTPStatus.CREATED,
+            HTTPStatus.TOO_MANY_REQUESTS
+        ], (
+            f'Проверьте, что POST-запросы к `{self.COMMENTS_URL_TEMPLATE}` '
+            'ограничиваются по лимиту области `comments`.'
+        )
+        assert admin_client.post(
+            url, data={'text': 'Другой автор'}
+        ).status_code == HTTPStatus.CREATED, (
+            'Проверьте, что у каждого пользователя своя корзина токенов.'
+        )
+        assert client.get(url).status_code == HTTPStatus.OK, (
+            'Проверьте, что запросы на чтение не ограничиваются.'
+        )
+
+    def test_03_bucket_refill(self, client, low_rates, monkeypatch,
+                              settings):
+        from api.throttling import ScopedTokenBucketThrottle
+
+        settings.API_THROTTLE = {'CACHE_ALIAS': 'default'}
+        now = [1000.0]
+        monkeypatch.setattr(
+            ScopedTokenBucketThrottle, 'timer', lambda self: now[0]
+        )
+        for idx in range(2):
+            assert self.signup(client, idx).status_code == HTTPStatus.OK
+        assert self.signup(client, 2).status_code == (
+            HTTPStatus.TOO_MANY_REQUESTS
+        )
+        now[0] += 30
+        assert self.signup(client, 2).status_code == HTTPStatus.OK, (
+            'Проверьте, что корзина пополняется со скоростью N токенов '
+            'за период.'
+        )
+        assert self.signup(client, 3).status_code == (
+            HTTPStatus.TOO_MANY_REQUESTS
+        )
+
+    def test_04_shared_bucket_lock(self, client, low_rates, monkeypatch,
+                                   settings):
+        from django.core.cache import cache
+
+        settings.API_THROTTLE = {'CACHE_ALIAS': 'default'}
+        calls = []
+        add = cache.add
+
+        def tracked_add(key, *args, **kwargs):
+            calls.append(key)
+            return add(key, *args, **kwargs)
+
+        monkeypatch.setattr(cache, 'add', tracked_add)
+        assert self.signup(client, 0).status_code == HTTPStatus.OK
+        lock_keys = [key for key in calls if key.endswith(':lock')]
+        assert lock_keys, (
+            'Проверьте, что общая корзина обновляется под блокировкой '
+            'на cache.add().'
+        )
+        assert cache.get(lock_keys[0]) is None, (
+            'Проверьте, что блокировка снимается после обновления корзины.'
+        )
+
+    def test_05_shared_bucket_skips_process_lock(self, settings):
+        import threading
+
+        from api.throttling import ScopedTokenBucketThrottle, _local_lock
+
+        settings.API_THROTTLE = {'CACHE_ALIAS': 'default'}
+        throttle = ScopedTokenBucketThrottle()
+        throttle.num_requests, throttle.duration = 2, 60
+        results = []
+        worker = threading.Thread(
+            target=lambda: results.append(throttle.take_token('bucket'))
+        )
+        with _local_lock:
+            worker.start()
+            worker.join(timeout=2)
+        assert results == [None], (
+            'Проверьте, что общая корзина не ждёт блокировки процесса: '
+            'иначе конкуренция за один ключ задерживает все запросы.'
+        )
@@ -0,0 +1,72 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26CachedAuthentication:
+
+    ME_URL = '/api/v1/users/me/'
+    USERS_URL = '/api/v1/users/'
+
+    def test_01_identity_without_queries(self, user_client, user):
+        assert user_client.get(self.ME_URL).status_code == HTTPStatus.OK
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.get(self.ME_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['username'] == user.username
+        assert not context.captured_queries, (
+            'Проверьте, что пользователь из JWT-токена берётся из кеша и '
+            'повторный запрос не обращается к базе.'
+        )
+
+    def test_02_role_change_invalidates(self, admin_client, user_client,
+                                        user):
+        assert user_client.get(self.USERS_URL).status_code == (
+            HTTPStatus.FORBIDDEN
+        )
+        response = admin_client.patch(
+            f'{self.USERS_URL}{user.username}/', data={'role': 'admin'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert user_client.get(self.USERS_URL).status_code == HTTPStatus.OK, (
+            'Проверьте, что изменение роли пользователя сбрасывает кеш '
+            'аутентификации.'
+        )
+
+    def test_03_deactivation_invalidates(self, user_client, user):
+        assert user_client.get(self.ME_URL).status_code == HTTPStatus.OK
+        user.is_active = False
+        user.save()
+        assert user_client.get(self.ME_URL).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        ), (
+            'Проверьте, что заблокированный пользователь не проходит '
+            'аутентификацию, даже если он был в кеше.'
+        )
+
+    def test_04_profile_update_visible(self, user_client, user):
+        user_client.patch(self.ME_URL, data={'bio': 'Новая биография'})
+        assert user_client.get(self.ME_URL).json()['bio'] == (
+            'Новая биография'
+        )
+
+    def test_05_writes_ignore_stale_cache(self, user_client, user,
+                                          django_user_model):
+        assert user_client.get(self.ME_URL).status_code == HTTPStatus.OK
+        # Изменение из другого процесса: сигналы не срабатывают.
+        django_user_model.objects.filter(pk=user.pk).update(
+            is_active=False, role='moderator'
+        )
+        response = user_client.patch(self.ME_URL, data={'bio': 'Снова тут'})
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что изменяющие запросы читают пользователя из базы, '
+            'а не из кеша аутентификации.'
+        )
+        user.refresh_from_db()
+        assert (user.is_active, user.role) == (False, 'moderator'), (
+            'Проверьте, что сохранение профиля не возвращает устаревшие '
+            'role и is_active из кеша.'
+        )
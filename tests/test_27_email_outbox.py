@@ -0,0 +1,176 @@
+from datetime import timedelta
+from http import HTTPStatus
+from smtplib import SMTPRecipientsRefused
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.utils import timezone
+
+STAND_IN_BACKEND = 'tests.test_27_email_outbox.StandInBackend'
+
+
+class StandInBackend(EmailBackend):
+    """Локальная замена SMTP: считает соединения и отклоняет адреса."""
+
+    connections_opened = 0
+    rejected = set()
+    during_send = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.connection = None
+
+    def open(self):
+        if self.connection:
+            return False
+        type(self).connections_opened += 1
+        self.connection = object()
+        return True
+
+    def close(self):
+        self.connection = None
+
+    def send_messages(self, messages):
+        during_send, type(self).during_send = type(self).during_send, None
+        if during_send:
+            during_send()
+        for message in messages:
+            if set(message.to) & self.rejected:
+                raise SMTPRecipientsRefused(
+                    {address: (550, b'rejected') for address in message.to}
+                )
+        return super().send_messages(messages)
+
+
+@pytest.fixture
+def stand_in_smtp(settings):
+    settings.EMAIL_BACKEND = STAND_IN_BACKEND
+    StandInBackend.connections_opened = 0
+    StandInBackend.rejected = set()
+    StandInBackend.during_send = None
+    return StandInBackend
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27EmailOutbox:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+
+    def signup(self, client, idx):
+        response = client.post(self.URL_SIGNUP, data={
+            'username': f'user{idx}', 'email': f'user{idx}@yamdb.fake'
+        })
+        assert response.status_code == HTTPStatus.OK
+        return response
+
+    def test_01_signup_enqueues_email(self, client, stand_in_smtp):
+        from users.models import OutgoingEmail
+
+        for idx in range(3):
+            self.signup(client, idx)
+        assert not mail.outbox, (
+            f'Проверьте, что POST-запрос к `{self.URL_SIGNUP}` не '
+            'отправляет письмо в ходе запроса.'
+        )
+        assert OutgoingEmail.objects.count() == 3, (
+            f'Проверьте, что POST-запрос к `{self.URL_SIGNUP}` ставит '
+            'письмо с кодом в очередь.'
+        )
+
+        call_command('send_outbox')
+        assert sorted(message.to[0] for message in mail.outbox) == [
+            f'user{idx}@yamdb.fake' for idx in range(3)
+        ]
+        assert stand_in_smtp.connections_opened == 1, (
+            'Проверьте, что команда `send_outbox` отправляет пачку писем '
+            'через одно соединение.'
+        )
+        assert not OutgoingEmail.objects.exists(), (
+            'Проверьте, что отправленные письма удаляются из очереди.'
+        )
+
+    def test_02_failed_email_retried_with_backoff(self, client,
+                                                  stand_in_smtp):
+        from users.models import OutgoingEmail
+
+        for idx in range(2):
+            self.signup(client, idx)
+        stand_in_smtp.rejected = {'user0@yamdb.fake'}
+
+        call_command('send_outbox')
+        assert [message.to for message in mail.outbox] == [
+            ['user1@yamdb.fake']
+        ], 'Проверьте, что ошибка одного письма не останавливает пачку.'
+        email = OutgoingEmail.objects.get()
+        assert email.attempts == 1 and email.last_error
+        assert email.next_attempt > timezone.now() + timedelta(seconds=20), (
+            'Проверьте, что неотправленное письмо откладывается.'
+        )
+
+        call_command('send_outbox')
+        assert len(mail.outbox) == 1, (
+            'Проверьте, что отложенное письмо не отправляется раньше срока.'
+        )
+
+        stand_in_smtp.rejected = set()
+        OutgoingEmail.objects.update(next_attempt=timezone.now())
+        call_command('send_outbox')
+        assert len(mail.outbox) == 2
+        assert not OutgoingEmail.objects.exists()
+
+    def test_03_attempts_limit(self, client, stand_in_smtp):
+        from users.models import OutgoingEmail
+
+        self.signup(client, 0)
+        stand_in_smtp.rejected = {'user0@yamdb.fake'}
+        for _ in range(2):
+            call_command('send_outbox', max_attempts=2)
+            OutgoingEmail.objects.update(next_attempt=timezone.now())
+        stand_in_smtp.rejected = set()
+        call_command('send_outbox', max_attempts=2)
+        assert not mail.outbox, (
+            'Проверьте, что после `--max-attempts` неудачных попыток '
+            'письмо больше не отправляется.'
+        )
+        assert not OutgoingEmail.objects.exists(), (
+            'Проверьте, что письма с исчерпанными попытками удаляются '
+            'из очереди.'
+        )
+
+    def test_04_overlapping_runs(self, client, stand_in_smtp):
+        from users.models import OutgoingEmail
+
+        for idx in range(3):
+            self.signup(client, idx)
+        # Второй запуск начинается, пока первый отправляет пачку.
+        stand_in_smtp.during_send = lambda: call_command('send_outbox')
+        call_command('send_outbox')
+        assert sorted(message.to[0] for message in mail.outbox) == [
+            f'user{idx}@yamdb.fake' for idx in range(3)
+        ], (
+            'Проверьте, что параллельные запуски `send_outbox` не '
+            'отправляют одно письмо дважды.'
+        )
+        assert not OutgoingEmail.objects.exists()
+
+    def test_05_stale_emails_purged(self, client, stand_in_smtp):
+        from users.constants import CONFIRMATION_CODE_TTL
+        from users.models import OutgoingEmail
+
+        for idx in range(2):
+            self.signup(client, idx)
+        OutgoingEmail.objects.filter(recipient='user0@yamdb.fake').update(
+            created=timezone.now() - timedelta(
+                seconds=CONFIRMATION_CODE_TTL + 1
+            )
+        )
+        call_command('send_outbox')
+        assert [message.to for message in mail.outbox] == [
+            ['user1@yamdb.fake']
+        ], (
+            'Проверьте, что письма старше срока действия кода не '
+            'отправляются.'
+        )
+        assert not OutgoingEmail.objects.exists()
@@ -0,0 +1,53 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28SignupCooldown:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+    DATA = {'username': 'retrying', 'email': 'retrying@yamdb.fake'}
+
+    def test_01_repeat_signup_short_circuits(self, client):
+        from users.models import OutgoingEmail
+
+        assert client.post(self.URL_SIGNUP, data=self.DATA).status_code == (
+            HTTPStatus.OK
+        )
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(self.URL_SIGNUP, data=self.DATA)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == self.DATA
+        assert not context.captured_queries, (
+            f'Проверьте, что повторный POST-запрос к `{self.URL_SIGNUP}` '
+            'с теми же данными в течение окна не обращается к базе.'
+        )
+        assert OutgoingEmail.objects.count() == 1, (
+            'Проверьте, что повторная регистрация в течение окна не '
+            'отправляет код ещё раз.'
+        )
+
+    def test_02_cooldown_scope(self, client):
+        from django.core.cache import cache
+
+        from users.models import OutgoingEmail
+
+        client.post(self.URL_SIGNUP, data=self.DATA)
+        response = client.post(self.URL_SIGNUP, data={
+            'username': self.DATA['username'], 'email': 'other@yamdb.fake'
+        })
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что окно действует только для той же пары '
+            'username и email.'
+        )
+
+        cache.clear()
+        assert client.post(self.URL_SIGNUP, data=self.DATA).status_code == (
+            HTTPStatus.OK
+        )
+        assert OutgoingEmail.objects.count() == 2, (
+            'Проверьте, что после окна код подтверждения отправляется снова.'
+        )
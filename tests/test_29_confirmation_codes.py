@@ -0,0 +1,150 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+
+@pytest.mark.django_db(transaction=True)
+class Test29ConfirmationCodes:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+    URL_TOKEN = '/api/v1/auth/token/'
+    USERNAME = 'coder'
+
+    def signup(self, client):
+        response = client.post(self.URL_SIGNUP, data={
+            'username': self.USERNAME, 'email': 'coder@yamdb.fake'
+        })
+        assert response.status_code == HTTPStatus.OK
+        call_command('send_outbox')
+        return mail.outbox[-1].body
+
+    def obtain_token(self, client, code):
+        return client.post(self.URL_TOKEN, data={
+            'username': self.USERNAME, 'confirmation_code': code
+        })
+
+    def wrong_code(self, code):
+        return str((int(code) + 1) % 10 ** len(code)).zfill(len(code))
+
+    def test_01_code_is_one_time(self, client):
+        from users.models import ConfirmationCode
+
+        code = self.signup(client)
+        assert code.isdigit(), 'Проверьте, что код подтверждения числовой.'
+        assert code not in ConfirmationCode.objects.get().code_hash, (
+            'Проверьте, что код подтверждения хранится в виде хеша.'
+        )
+        response = self.obtain_token(client, code)
+        assert response.status_code == HTTPStatus.OK
+        assert 'token' in response.json()
+        assert self.obtain_token(client, code).status_code == (
+            HTTPStatus.BAD_REQUEST
+        ), 'Проверьте, что код подтверждения можно использовать один раз.'
+
+    def test_02_single_indexed_read(self, client):
+        code = self.signup(client)
+        with CaptureQueriesContext(connection) as context:
+            response = self.obtain_token(client, code)
+        assert response.status_code == HTTPStatus.OK
+        selects = [
+            query for query in context.captured_queries
+            if query['sql'].startswith('SELECT')
+        ]
+        assert len(selects) == 1, (
+            f'Проверьте, что `{self.URL_TOKEN}` находит пользователя и его '
+            'код одним запросом.'
+        )
+
+    def test_03_attempts_limit(self, client):
+        from django.core.cache import cache
+
+        from users.constants import MAX_CONFIRMATION_ATTEMPTS
+        from users.models import ConfirmationCode
+
+        code = self.signup(client)
+        for _ in range(MAX_CONFIRMATION_ATTEMPTS):
+            assert self.obtain_token(
+                client, self.wrong_code(code)
+            ).status_code == HTTPStatus.BAD_REQUEST
+        assert self.obtain_token(client, code).status_code == (
+            HTTPStatus.BAD_REQUEST
+        ), (
+            'Проверьте, что после исчерпания попыток верный код тоже '
+            'отклоняется.'
+        )
+
+        cache.clear()  # Окно повторной регистрации истекло.
+        code = self.signup(client)
+        assert self.obtain_token(client, code).status_code == (
+            HTTPStatus.BAD_REQUEST
+        ), (
+            'Проверьте, что повторная регистрация не сбрасывает счётчик '
+            'неверных попыток до окончания блокировки.'
+        )
+
+        ConfirmationCode.objects.update(
+            locked_until=timezone.now() - timedelta(seconds=1)
+        )
+        cache.clear()
+        code = self.signup(client)
+        assert self.obtain_token(client, code).status_code == HTTPStatus.OK, (
+            'Проверьте, что после окончания блокировки новый код работает.'
+        )
+
+    def test_04_attempts_counted_in_database(self, client):
+        from users.constants import MAX_CONFIRMATION_ATTEMPTS
+        from users.models import ConfirmationCode
+
+        code = self.signup(client)
+        stale = ConfirmationCode.objects.get()
+        ConfirmationCode.objects.update(attempts=MAX_CONFIRMATION_ATTEMPTS)
+        assert not stale.verify(code), (
+            'Проверьте, что попытка списывается условным UPDATE, а не по '
+            'загруженному ранее значению счётчика.'
+        )
+
+        ConfirmationCode.objects.update(
+            attempts=MAX_CONFIRMATION_ATTEMPTS - 1
+        )
+        stale = ConfirmationCode.objects.get()
+        assert not stale.verify(self.wrong_code(code))
+        assert ConfirmationCode.objects.get().locked_until, (
+            'Проверьте, что последняя неверная попытка блокирует код.'
+        )
+
+    def test_05_expiry_and_purge(self, client, user):
+        from users.constants import CONFIRMATION_LOCKOUT
+        from users.models import ConfirmationCode
+
+        code = self.signup(client)
+        ConfirmationCode.objects.issue(user)
+        ConfirmationCode.objects.filter(user__username=self.USERNAME).update(
+            expires=timezone.now() - timedelta(seconds=1)
+        )
+        assert self.obtain_token(client, code).status_code == (
+            HTTPStatus.BAD_REQUEST
+        ), 'Проверьте, что просроченный код отклоняется.'
+
+        call_command('purge_confirmation_codes')
+        assert ConfirmationCode.objects.count() == 2, (
+            'Проверьте, что недавно истёкшие коды хранятся до конца '
+            'возможной блокировки.'
+        )
+        ConfirmationCode.objects.filter(user__username=self.USERNAME).update(
+            expires=timezone.now() - timedelta(
+                seconds=CONFIRMATION_LOCKOUT + 1
+            )
+        )
+        call_command('purge_confirmation_codes')
+        assert list(
+            ConfirmationCode.objects.values_list('user__username', flat=True)
+        ) == [user.username], (
+            'Проверьте, что команда `purge_confirmation_codes` удаляет '
+            'только просроченные коды.'
+        )
@@ -0,0 +1,92 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+
+@pytest.fixture
+def rotation(settings):
+    settings.SIMPLE_JWT = {
+        **settings.SIMPLE_JWT,
+        'ROTATE_REFRESH_TOKENS': True,
+        'BLACKLIST_AFTER_ROTATION': True,
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+class Test30RefreshTokens:
+
+    URL_TOKEN = '/api/v1/auth/token/'
+    URL_REFRESH = '/api/v1/auth/token/refresh/'
+    ME_URL = '/api/v1/users/me/'
+
+    def obtain_tokens(self, client, user):
+        from users.models import ConfirmationCode
+
+        response = client.post(self.URL_TOKEN, data={
+            'username': user.username,
+            'confirmation_code': ConfirmationCode.objects.issue(user),
+        })
+        assert response.status_code == HTTPStatus.OK
+        tokens = response.json()
+        assert 'refresh' in tokens, (
+            f'Проверьте, что ответ `{self.URL_TOKEN}` содержит refresh-токен.'
+        )
+        return tokens
+
+    def refresh(self, client, token):
+        return client.post(self.URL_REFRESH, data={'refresh': token})
+
+    def test_01_refresh_without_database(self, client, user):
+        tokens = self.obtain_tokens(client, user)
+        with CaptureQueriesContext(connection) as context:
+            response = self.refresh(client, tokens['refresh'])
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что POST-запрос к `{self.URL_REFRESH}` с '
+            'refresh-токеном возвращает ответ со статусом 200.'
+        )
+        assert not context.captured_queries, (
+            'Проверьте, что без ротации обновление токена не обращается '
+            'к базе.'
+        )
+        data = response.json()
+        assert 'refresh' not in data
+        api_client = APIClient()
+        api_client.credentials(HTTP_AUTHORIZATION=f'Bearer {data["token"]}')
+        assert api_client.get(self.ME_URL).json()['username'] == (
+            user.username
+        )
+
+        for invalid in ('', 'not-a-token', data['token']):
+            assert self.refresh(client, invalid).status_code in (
+                HTTPStatus.BAD_REQUEST, HTTPStatus.UNAUTHORIZED
+            ), 'Проверьте, что некорректный refresh-токен отклоняется.'
+
+    def test_02_rotation_revokes_used_token(self, client, user, rotation):
+        from users.models import RevokedToken
+
+        tokens = self.obtain_tokens(client, user)
+        response = self.refresh(client, tokens['refresh'])
+        assert response.status_code == HTTPStatus.OK
+        rotated = response.json()['refresh']
+        assert rotated != tokens['refresh'], (
+            'Проверьте, что при ротации выдаётся новый refresh-токен.'
+        )
+        assert self.refresh(client, tokens['refresh']).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        ), 'Проверьте, что использованный refresh-токен отозван.'
+        assert self.refresh(client, rotated).status_code == HTTPStatus.OK
+
+        RevokedToken.objects.filter(
+            pk=RevokedToken.objects.order_by('expires').first().pk
+        ).update(expires=timezone.now() - timedelta(seconds=1))
+        call_command('purge_revoked_tokens')
+        assert RevokedToken.objects.count() == 1, (
+            'Проверьте, что команда `purge_revoked_tokens` удаляет только '
+            'истёкшие токены.'
+        )